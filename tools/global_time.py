@@ -2,14 +2,537 @@ import tkinter as tk
 from tkinter import ttk
 import datetime
 import pytz
-import threading
 import time
 import json
 import os
 import argparse
-from functools import partial
+import itertools
+import sys
+import csv
+import io
+import tempfile
+import stat
+import bisect
+import calendar
+import unicodedata
+from collections import Counter
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+# Display colors offered in the settings tab
+COLORS = {
+    "Blue": "#3498db",
+    "Red": "#e74c3c",
+    "Green": "#2ecc71",
+    "Orange": "#f39c12",
+    "Purple": "#9b59b6",
+    "Teal": "#1abc9c",
+    "Dark Orange": "#d35400",
+    "Dark Red": "#c0392b",
+    "Gray": "#7f8c8d",
+    "Dark Green": "#27ae60"
+}
+
+# Cities people search for that are not named in the tz database
+CITY_TIMEZONES = {
+    "Abu Dhabi": "Asia/Dubai", "Amsterdam": "Europe/Amsterdam", "Ankara": "Europe/Istanbul",
+    "Atlanta": "America/New_York", "Austin": "America/Chicago", "Bangalore": "Asia/Kolkata",
+    "Barcelona": "Europe/Madrid", "Beijing": "Asia/Shanghai", "Boston": "America/New_York",
+    "Brasilia": "America/Sao_Paulo", "Cape Town": "Africa/Johannesburg", "Chennai": "Asia/Kolkata",
+    "Dallas": "America/Chicago", "Delhi": "Asia/Kolkata", "Denver": "America/Denver",
+    "Frankfurt": "Europe/Berlin", "Geneva": "Europe/Zurich", "Guangzhou": "Asia/Shanghai",
+    "Hanoi": "Asia/Bangkok", "Houston": "America/Chicago", "Hyderabad": "Asia/Kolkata",
+    "Islamabad": "Asia/Karachi", "Kyoto": "Asia/Tokyo", "Las Vegas": "America/Los_Angeles",
+    "Lyon": "Europe/Paris", "Manchester": "Europe/London", "Miami": "America/New_York",
+    "Milan": "Europe/Rome", "Montreal": "America/Toronto", "Mumbai": "Asia/Kolkata",
+    "Munich": "Europe/Berlin", "New Delhi": "Asia/Kolkata", "Osaka": "Asia/Tokyo",
+    "Ottawa": "America/Toronto", "Philadelphia": "America/New_York", "Phoenix": "America/Phoenix",
+    "Portland": "America/Los_Angeles", "Rio de Janeiro": "America/Sao_Paulo",
+    "Saint Petersburg": "Europe/Moscow", "San Diego": "America/Los_Angeles",
+    "San Francisco": "America/Los_Angeles", "Seattle": "America/Los_Angeles",
+    "Shenzhen": "Asia/Shanghai", "St. Louis": "America/Chicago", "Sydney": "Australia/Sydney",
+    "Tel Aviv": "Asia/Jerusalem", "Washington": "America/New_York", "Wellington": "Pacific/Auckland",
+    "Zurich": "Europe/Zurich",
+}
+
+# Common abbreviations, mapped to a representative zone
+TIMEZONE_ALIASES = {
+    "AEST": "Australia/Sydney", "BST": "Europe/London", "CET": "Europe/Paris",
+    "CST": "America/Chicago", "EET": "Europe/Helsinki", "EST": "America/New_York",
+    "GMT": "Etc/GMT", "HKT": "Asia/Hong_Kong", "IST": "Asia/Kolkata", "JST": "Asia/Tokyo",
+    "KST": "Asia/Seoul", "MST": "America/Denver", "NZST": "Pacific/Auckland",
+    "PST": "America/Los_Angeles", "SGT": "Asia/Singapore", "UTC": "UTC",
+    "LA": "America/Los_Angeles", "NYC": "America/New_York", "SF": "America/Los_Angeles",
+}
+
+# numpy is only needed by the meeting planner, so it is imported on first use
+np = None
+
+def load_numpy():
+    global np
+    if np is None:
+        import numpy as np
+
+class TimezoneRegistry:
+    """Cache of timezone objects and their UTC offsets
+
+    Each zone is resolved with pytz once. Its UTC transition table is
+    converted to epoch seconds, so the offset valid at a timestamp is found
+    by bisection and then cached together with the interval it is valid
+    for. Until the next DST change, local time is just `now + offset`.
+    """
+    
+    def __init__(self):
+        self.zones = {}        # name -> pytz timezone
+        self.transitions = {}  # name -> (epoch transition times, offsets in seconds)
+        self.current = {}      # name -> (offset, valid_from, valid_until)
+        self.names = None      # all timezone names, sorted once
+        self.arrays = {}       # name -> transition times and offsets as numpy arrays
+        
+    def all_names(self):
+        """All timezone names, sorted once and shared by every timezone picker"""
+        if self.names is None:
+            self.names = tuple(sorted(pytz.all_timezones))
+        return self.names
+        
+    def get(self, name):
+        """The pytz timezone for name, resolved only once"""
+        tz = self.zones.get(name)
+        if tz is None:
+            tz = self.zones[name] = pytz.timezone(name)
+        return tz
+        
+    def load_transitions(self, name):
+        tz = self.get(name)
+        if hasattr(tz, "_utc_transition_times"):
+            times = [calendar.timegm(t.timetuple()) for t in tz._utc_transition_times]
+            offsets = [int(info[0].total_seconds()) for info in tz._transition_info]
+        else:
+            # Fixed-offset zones (UTC, Etc/GMT+5, ...) never change
+            times = [float("-inf")]
+            offsets = [int(tz.utcoffset(datetime.datetime(2000, 1, 1)).total_seconds())]
+        self.transitions[name] = (times, offsets)
+        return times, offsets
+        
+    def offset(self, name, ts):
+        """UTC offset in seconds for zone name at epoch time ts"""
+        cached = self.current.get(name)
+        if cached and cached[1] <= ts < cached[2]:
+            return cached[0]
+            
+        times, offsets = self.transitions.get(name) or self.load_transitions(name)
+        i = max(bisect.bisect_right(times, ts) - 1, 0)
+        valid_until = times[i + 1] if i + 1 < len(times) else float("inf")
+        self.current[name] = (offsets[i], times[i], valid_until)
+        return offsets[i]
+        
+    def transition_arrays(self, name):
+        """Transition times and offsets of a zone as int64 arrays, for vectorised lookups"""
+        load_numpy()
+        arrays = self.arrays.get(name)
+        if arrays is None:
+            times, offsets = self.transitions.get(name) or self.load_transitions(name)
+            times = [t if t != float("-inf") else -2**62 for t in times]
+            arrays = self.arrays[name] = (np.array(times, dtype=np.int64), np.array(offsets, dtype=np.int64))
+        return arrays
+        
+    def offsets_at(self, name, ts):
+        """UTC offsets in seconds of zone name for an int64 array of epoch seconds"""
+        times, offsets = self.transition_arrays(name)
+        index = np.searchsorted(times, ts, side="right") - 1
+        return offsets[np.maximum(index, 0)]
+        
+    def next_transition(self, name, ts=None):
+        """Epoch time of the next offset change after ts (inf if none is scheduled)"""
+        ts = time.time() if ts is None else ts
+        self.offset(name, ts)
+        return self.current[name][2]
+        
+    def local_time(self, name, ts=None):
+        """Naive local datetime in zone name at epoch time ts"""
+        ts = time.time() if ts is None else ts
+        return _EPOCH + datetime.timedelta(seconds=ts + self.offset(name, ts))
+
+class MeetingPlanner:
+    """Vectorised meeting search across many cities and candidate slots
+
+    For N timezones and S slot start times, local times come from one
+    searchsorted per zone over its transition table, and working-hours and
+    weekend flags are computed for the whole N x S matrix at once.
+    """
+    
+    def __init__(self, registry, work_start=9, work_end=17):
+        self.registry = registry
+        self.work_start = work_start
+        self.work_end = work_end
+        
+    def matrix(self, tz_names, start_ts, days, slot_minutes):
+        """Local times and working-hours/weekend flags for every zone x slot"""
+        load_numpy()
+        slots = int(start_ts) + np.arange(0, days * 86400, slot_minutes * 60, dtype=np.int64)
+        offsets = np.empty((len(tz_names), len(slots)), dtype=np.int64)
+        for i, name in enumerate(tz_names):
+            offsets[i] = self.registry.offsets_at(name, slots)
+            
+        local = slots[np.newaxis, :] + offsets
+        minute_of_day = (local // 60) % 1440
+        weekday = (local // 86400 + 3) % 7  # 1970-01-01 was a Thursday (3)
+        weekend = weekday >= 5
+        working = ((minute_of_day >= self.work_start * 60)
+                   & (minute_of_day < self.work_end * 60)
+                   & ~weekend)
+        return {"slots": slots, "local": local, "working": working, "weekend": weekend}
+        
+    def best_slots(self, tz_names, start_ts, days=7, slot_minutes=30, duration_minutes=60, top=10):
+        """Meeting start times ranked by how many cities are in working hours throughout
+
+        Each result's "cities" holds the positions in tz_names that are
+        available, so several cities may share a timezone.
+        """
+        m = self.matrix(tz_names, start_ts, days, slot_minutes)
+        slots, working = m["slots"], m["working"]
+        span = max(1, -(-duration_minutes // slot_minutes))
+        starts = len(slots) - span + 1
+        if starts <= 0:
+            return []
+            
+        # A city is available for a meeting starting at slot j only if all
+        # `span` slots it covers are within its working hours
+        counts = np.concatenate(
+            [np.zeros((len(tz_names), 1), dtype=np.int64), np.cumsum(working, axis=1)], axis=1)
+        available = (counts[:, span:span + starts] - counts[:, :starts]) == span
+        score = available.sum(axis=0)
+        
+        # Highest score first, earliest slot among equals
+        order = np.lexsort((np.arange(starts), -score))[:top]
+        return [
+            {
+                "start": int(slots[j]),
+                "available": int(score[j]),
+                "cities": np.flatnonzero(available[:, j]).tolist()
+            }
+            for j in order
+        ]
+
+class TimezoneIndex:
+    """Fuzzy search over timezone names, countries, cities and abbreviations
+
+    Every entry has a display label, a zone and normalised search text
+    (lowercase, accents stripped). Queries of three or more characters are
+    ranked by shared trigrams; shorter ones use a prefix lookup on words.
+    The entries and trigram postings are cached in a JSON file and rebuilt
+    when the pytz version or the bundled tables change.
+    """
+    
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file
+        self.version = f"{pytz.__version__}-{len(CITY_TIMEZONES)}-{len(TIMEZONE_ALIASES)}"
+        if not self.load_cache():
+            self.build()
+            self.save_cache()
+        self.prefixes = sorted(
+            (word, i) for i, (_, _, text) in enumerate(self.entries) for word in text.split())
+        
+    @staticmethod
+    def normalize(text):
+        """Lowercase ASCII words: 'São_Paulo' -> 'sao paulo'"""
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+        for sep in "/_-.,()":
+            text = text.replace(sep, " ")
+        return " ".join(text.lower().split())
+        
+    @staticmethod
+    def trigrams(text):
+        padded = f" {text} "
+        return {padded[i:i + 3] for i in range(len(padded) - 2)}
+        
+    def build(self):
+        """Collect entries and build the trigram postings"""
+        entries = []
+        for name in pytz.all_timezones:
+            # Search text starts with the city so prefix matches rank first
+            parts = name.split("/")
+            entries.append((parts[-1].replace("_", " "), name, self.normalize(" ".join(parts[-1:] + parts[:-1]))))
+        for code, zones in pytz.country_timezones.items():
+            country = pytz.country_names.get(code, code)
+            for name in zones:
+                label = country if len(zones) == 1 else f"{country} ({name.rsplit('/', 1)[-1].replace('_', ' ')})"
+                entries.append((label, name, self.normalize(f"{label} {code}")))
+        for table in (CITY_TIMEZONES, TIMEZONE_ALIASES):
+            for label, name in table.items():
+                entries.append((label, name, self.normalize(label)))
+                
+        self.entries = entries
+        self.postings = {}
+        for i, (_, _, text) in enumerate(entries):
+            for gram in self.trigrams(text):
+                self.postings.setdefault(gram, []).append(i)
+                
+    def load_cache(self):
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return False
+        try:
+            with open(self.cache_file, 'r') as f:
+                data = json.load(f)
+            if data.get("version") != self.version:
+                return False
+            self.entries = [tuple(entry) for entry in data["entries"]]
+            self.postings = data["postings"]
+            return True
+        except Exception as e:
+            print(f"Error loading timezone index, rebuilding: {e}")
+            return False
+            
+    def save_cache(self):
+        if not self.cache_file:
+            return
+        try:
+            with open(self.cache_file, 'w') as f:
+                json.dump({"version": self.version, "entries": self.entries, "postings": self.postings}, f)
+        except Exception as e:
+            print(f"Error saving timezone index: {e}")
+            
+    def search(self, query, limit=10):
+        """Best matching (label, zone) pairs for a free-text query"""
+        query = self.normalize(query)
+        if not query:
+            return []
+            
+        if len(query) < 3:
+            start = bisect.bisect_left(self.prefixes, (query,))
+            candidates = Counter()
+            for word, i in self.prefixes[start:]:
+                if not word.startswith(query):
+                    break
+                candidates[i] = 1
+        else:
+            grams = self.trigrams(query)
+            candidates = Counter()
+            for gram in grams:
+                candidates.update(self.postings.get(gram, ()))
+            # Require a reasonable overlap so short queries don't match everything
+            threshold = max(1, len(grams) // 3)
+            candidates = Counter({i: n / len(grams) for i, n in candidates.items() if n >= threshold})
+            
+        def rank(i):
+            text = self.entries[i][2]
+            bonus = 1.0 if text.startswith(query) else 0.5 if query in text else 0.0
+            return (-(candidates[i] + bonus), len(text))
+            
+        results = []
+        seen = set()
+        for i in sorted(candidates, key=rank):
+            label, name, _ = self.entries[i]
+            if (label, name) not in seen:
+                seen.add((label, name))
+                results.append((label, name))
+                if len(results) == limit:
+                    break
+        return results
+
+class TimeConverter:
+    """Converts batches of timestamps to local ISO-8601 times in several zones
+
+    Epoch numbers (s, ms, us or ns) and ISO-8601 strings are parsed into an
+    array of epoch seconds; each zone's offsets are then looked up with one
+    searchsorted over its transition table and the local times formatted by
+    numpy, so the per-row Python work is limited to reading and writing.
+    """
+    
+    UNITS = {"s": 1, "ms": 10**3, "us": 10**6, "ns": 10**9}
+    
+    def __init__(self, registry, tz_names, unit="auto"):
+        load_numpy()
+        self.registry = registry
+        self.tz_names = tz_names
+        self.unit = unit
+        self.times_of_day = None
+        self.suffixes = {}  # zone name -> (distinct offsets, "+hh:mm" for each)
+        
+    @staticmethod
+    def parse_one(value):
+        """Epoch seconds for one value that isn't a plain number, or NaN"""
+        try:
+            parsed = datetime.datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+        except ValueError:
+            return float("nan")
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+        return parsed.timestamp()
+        
+    def parse(self, values):
+        """Epoch seconds for a batch of values (NaN where a value can't be parsed)"""
+        numbers = np.full(len(values), np.nan)
+        is_number = np.zeros(len(values), dtype=bool)
+        try:
+            numbers = np.asarray(values, dtype=np.float64)
+            is_number[:] = True
+        except (ValueError, TypeError):
+            for i, value in enumerate(values):
+                try:
+                    numbers[i] = float(value)
+                    is_number[i] = True
+                except (ValueError, TypeError):
+                    numbers[i] = self.parse_one(value)
+                    
+        if self.unit == "auto":
+            # Guess the unit from the magnitude: seconds are ~1e9 for current dates
+            magnitude = np.abs(numbers)
+            scale = np.select([magnitude >= 1e17, magnitude >= 1e14, magnitude >= 1e11], [1e9, 1e6, 1e3], 1.0)
+        else:
+            scale = self.UNITS[self.unit]
+        return np.where(is_number, numbers / scale, numbers)
+        
+    def time_of_day_table(self):
+        """'THH:MM:SS' for every second of the day (one 3 MB table shared by all zones)"""
+        if self.times_of_day is None:
+            times = np.datetime_as_string(np.arange(86400).astype("datetime64[s]"), unit="s")
+            self.times_of_day = np.char.lstrip(times, "0123456789-")
+        return self.times_of_day
+        
+    def offset_suffixes(self, name):
+        """A zone's distinct UTC offsets, sorted, and their '+hh:mm' suffixes"""
+        cached = self.suffixes.get(name)
+        if cached is None:
+            offsets = np.unique(self.registry.transition_arrays(name)[1])
+            suffixes = []
+            for offset in offsets.tolist():
+                sign = "+" if offset >= 0 else "-"
+                hours, minutes = divmod(abs(offset) // 60, 60)
+                suffixes.append(f"{sign}{hours:02d}:{minutes:02d}")
+            cached = self.suffixes[name] = (offsets, np.array(suffixes))
+        return cached
+        
+    def convert(self, values):
+        """One list of local time strings per zone ("" for unparseable values)
+
+        Strings are assembled from a formatted date per distinct day, a
+        shared table of times of day and the zone's offset suffixes, which
+        is much cheaper than formatting every timestamp in full.
+        """
+        seconds = self.parse(values)
+        valid = np.isfinite(seconds) & (np.abs(seconds) < 253402300800)  # before year 10000
+        fill = seconds[valid][0] if valid.any() else 0
+        ts = np.floor(np.where(valid, seconds, fill)).astype(np.int64)
+        
+        columns = []
+        for name in self.tz_names:
+            offsets = self.registry.offsets_at(name, ts)
+            days, second_of_day = np.divmod(ts + offsets, 86400)
+            
+            # Format each day once: a contiguous range when the data is
+            # dense in time, otherwise only the distinct days
+            first_day, last_day = (int(days.min()), int(days.max())) if len(days) else (0, 0)
+            if last_day - first_day <= 4 * len(days) + 366:
+                day_values, day_index = np.arange(first_day, last_day + 1), days - first_day
+            else:
+                day_values, day_index = np.unique(days, return_inverse=True)
+            dates = np.datetime_as_string(day_values.astype("datetime64[D]"))
+            
+            zone_offsets, suffixes = self.offset_suffixes(name)
+            text = np.char.add(dates[day_index.ravel()], self.time_of_day_table()[second_of_day])
+            text = np.char.add(text, suffixes[np.searchsorted(zone_offsets, offsets)])
+            columns.append(np.where(valid, text, "").tolist())
+        return columns
+
+class SettingsStore:
+    """The settings file, written atomically and watched for outside changes
+
+    Saves go to a temp file in the same directory which then replaces the
+    settings file, so an interrupted write leaves the previous settings in
+    place. The file's mtime and size after each read or write are kept so
+    that `changed` can tell when another process or editor modified it.
+    """
+    
+    def __init__(self, path):
+        self.path = path
+        self.signature = None
+        
+    def stat_signature(self):
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+        
+    def exists(self):
+        return os.path.exists(self.path)
+        
+    def load(self, quarantine=False):
+        """The saved cities, or None if the file is missing or unreadable
+        
+        With quarantine an unreadable file is moved aside to .corrupt so the
+        defaults saved next don't overwrite it. The watcher leaves it alone,
+        since it may just be catching another program halfway through a write.
+        """
+        try:
+            with open(self.path, 'r') as f:
+                cities = json.load(f)
+            if not isinstance(cities, list):
+                raise ValueError("expected a list of cities")
+            self.signature = self.stat_signature()
+            return self.valid_cities(cities)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            if quarantine:
+                # Keep the unreadable file for inspection instead of overwriting it later
+                print(f"Error loading settings ({e}), moved to {self.path}.corrupt")
+                os.replace(self.path, self.path + ".corrupt")
+            return None
+            
+    @staticmethod
+    def valid_cities(cities):
+        """The cities that have a name and a known timezone; others are skipped"""
+        valid = []
+        for city in cities:
+            if not (isinstance(city, dict) and isinstance(city.get("name"), str)
+                    and city.get("timezone") in pytz.all_timezones_set):
+                print(f"Skipping invalid city in settings: {city!r}")
+                continue
+            city = dict(city)
+            if not isinstance(city.get("color", ""), str):
+                del city["color"]
+            valid.append(city)
+        return valid
+        
+    def file_mode(self):
+        """Permissions for a saved file: the current file's, else the umask default"""
+        try:
+            return stat.S_IMODE(os.stat(self.path).st_mode)
+        except OSError:
+            umask = os.umask(0)
+            os.umask(umask)
+            return 0o666 & ~umask
+            
+    def save(self, cities):
+        directory = os.path.dirname(self.path) or "."
+        mode = self.file_mode()
+        fd, tmp_file = tempfile.mkstemp(prefix=".settings-", suffix=".tmp", dir=directory)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(cities, f, indent=2)
+                f.flush()
+                os.fsync(f.fileno())
+            # mkstemp creates the file private (0600), so keep the usual permissions
+            os.chmod(tmp_file, mode)
+            os.replace(tmp_file, self.path)
+        except Exception:
+            os.unlink(tmp_file)
+            raise
+        self.signature = self.stat_signature()
+        
+    def changed(self):
+        """True if the file was modified since we last read or wrote it"""
+        signature = self.stat_signature()
+        return signature is not None and signature != self.signature
 
 class GlobalTimeApp:
+    # Settings edits are saved once they pause for this long
+    SAVE_DELAY_MS = 500
+    # How often the settings file is checked for outside changes
+    WATCH_INTERVAL_MS = 2000
+    
     def __init__(self, root=None):
         # Default cities and timezones
         self.default_cities = [
@@ -29,13 +552,24 @@ class GlobalTimeApp:
         self.config_dir = "global_time_config"
         os.makedirs(self.config_dir, exist_ok=True)
         self.config_file = os.path.join(self.config_dir, "settings.json")
+        self.settings_store = SettingsStore(self.config_file)
+        
+        # Pending after() ids of the debounced save and the settings file poll
+        self.save_job = None
+        self.watch_job = None
         
         # Load settings or use defaults
         self.cities = self.load_settings()
         
-        # For time update thread
+        # Resolved timezones and cached UTC offsets
+        self.tz_registry = TimezoneRegistry()
+        
+        # Search index for adding cities, built on first use
+        self.tz_index = None
+        
+        # Pending after() id of the once-per-second clock update
         self.running = False
-        self.update_thread = None
+        self.update_job = None
         
         # Set up UI if root is provided
         self.root = root
@@ -44,26 +578,29 @@ class GlobalTimeApp:
     
     def load_settings(self):
         """Load settings from file or use defaults if file doesn't exist"""
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, 'r') as f:
-                    return json.load(f)
-            except:
-                print("Error loading settings, using defaults")
-                return self.default_cities
-        else:
-            # Save default settings
-            self.save_settings(self.default_cities)
-            return self.default_cities
+        if self.settings_store.exists():
+            cities = self.settings_store.load(quarantine=True)
+            if cities:
+                return cities
+            print("Using default settings")
+            
+        # Save default settings
+        self.save_settings(self.default_cities)
+        return self.default_cities
     
+    def timezone_index(self):
+        """The timezone search index, loaded from its cache file on first use"""
+        if self.tz_index is None:
+            self.tz_index = TimezoneIndex(os.path.join(self.config_dir, "timezone_index.json"))
+        return self.tz_index
+        
     def save_settings(self, cities=None):
         """Save current settings to file"""
         if cities is None:
             cities = self.cities
             
         try:
-            with open(self.config_file, 'w') as f:
-                json.dump(cities, f, indent=2)
+            self.settings_store.save(cities)
         except Exception as e:
             print(f"Error saving settings: {e}")
     
@@ -113,74 +650,79 @@ class GlobalTimeApp:
         # Set up settings tab
         self.setup_settings(settings_tab)
         
-        # Start time update thread
+        # Start the clock on the Tk main loop; it pauses while minimized
         self.running = True
-        self.update_thread = threading.Thread(target=self.update_time_thread)
-        self.update_thread.daemon = True
-        self.update_thread.start()
+        self.root.bind("<Unmap>", self.on_unmap)
+        self.root.bind("<Map>", self.on_map)
+        self.update_time()
+        self.schedule_update()
+        
+        # Pick up edits made to the settings file outside the app
+        self.watch_job = self.root.after(self.WATCH_INTERVAL_MS, self.watch_settings_file)
         
         # Handle window close
         self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
         
     def setup_time_display(self, parent):
         """Set up time display area"""
-        # Filter to show only favorite cities
-        favorite_cities = [city for city in self.cities if city.get("favorite", False)]
-        
-        # Create time frames for each city
+        # Time frames of the favorite cities, in display order
         self.time_frames = []
         
         # Create time display area with scrollbar if needed
         display_canvas = tk.Canvas(parent)
         scrollbar = ttk.Scrollbar(parent, orient="vertical", command=display_canvas.yview)
-        scrollable_frame = ttk.Frame(display_canvas)
+        self.time_list_frame = ttk.Frame(display_canvas)
         
-        scrollable_frame.bind(
+        self.time_list_frame.bind(
             "<Configure>",
             lambda e: display_canvas.configure(
                 scrollregion=display_canvas.bbox("all")
             )
         )
         
-        display_canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
+        display_canvas.create_window((0, 0), window=self.time_list_frame, anchor="nw")
         display_canvas.configure(yscrollcommand=scrollbar.set)
         
         display_canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        # Create time displays for each favorite city
-        for i, city in enumerate(favorite_cities):
-            frame = ttk.Frame(scrollable_frame, padding=10)
-            frame.pack(fill=tk.X, pady=5)
-            
-            # City name with colored indicator
-            city_frame = ttk.Frame(frame)
-            city_frame.pack(fill=tk.X)
-            
-            color_indicator = tk.Canvas(city_frame, width=15, height=15, highlightthickness=0)
-            color_indicator.create_oval(0, 0, 15, 15, fill=city.get("color", "#cccccc"), outline="")
-            color_indicator.pack(side=tk.LEFT, padx=(0, 5))
-            
-            city_label = ttk.Label(city_frame, text=city["name"], style="City.TLabel")
-            city_label.pack(side=tk.LEFT)
-            
-            # Time and date labels
-            time_label = ttk.Label(frame, text="", style="Time.TLabel")
-            time_label.pack(fill=tk.X, pady=(5, 0))
-            
-            date_label = ttk.Label(frame, text="", style="Date.TLabel")
-            date_label.pack(fill=tk.X)
-            
-            # Store references for updating
-            self.time_frames.append({
-                "city": city,
-                "time_label": time_label,
-                "date_label": date_label
-            })
-            
-            # Add separator except for last item
-            if i < len(favorite_cities) - 1:
-                ttk.Separator(scrollable_frame, orient="horizontal").pack(fill=tk.X, pady=10)
+        self.refresh_time_display()
+        
+    def create_time_frame(self, city):
+        """Create the widgets showing one city's time"""
+        container = ttk.Frame(self.time_list_frame)
+        frame = ttk.Frame(container, padding=10)
+        frame.pack(fill=tk.X, pady=5)
+        
+        # City name with colored indicator
+        city_frame = ttk.Frame(frame)
+        city_frame.pack(fill=tk.X)
+        
+        color_indicator = tk.Canvas(city_frame, width=15, height=15, highlightthickness=0)
+        color_indicator.create_oval(0, 0, 15, 15, fill=city.get("color", "#cccccc"), outline="")
+        color_indicator.pack(side=tk.LEFT, padx=(0, 5))
+        
+        city_label = ttk.Label(city_frame, text=city["name"], style="City.TLabel")
+        city_label.pack(side=tk.LEFT)
+        
+        # Time and date labels
+        time_label = ttk.Label(frame, text="", style="Time.TLabel")
+        time_label.pack(fill=tk.X, pady=(5, 0))
+        
+        date_label = ttk.Label(frame, text="", style="Date.TLabel")
+        date_label.pack(fill=tk.X)
+        
+        # Store references for updating, with the text last shown
+        return {
+            "city": city,
+            "key": (city["name"], city["timezone"], city.get("color")),
+            "container": container,
+            "separator": ttk.Separator(container, orient="horizontal"),
+            "time_label": time_label,
+            "date_label": date_label,
+            "time_text": None,
+            "date": None
+        }
     
     def setup_meeting_planner(self, parent):
         """Set up meeting planner tab"""
@@ -234,17 +776,35 @@ class GlobalTimeApp:
         
         # Create dropdown for timezone selection
         self.base_timezone = tk.StringVar()
-        timezone_dropdown = ttk.Combobox(tz_frame, textvariable=self.base_timezone, state="readonly", width=20)
-        timezone_dropdown.grid(row=0, column=1, padx=5)
+        self.base_timezone_dropdown = ttk.Combobox(tz_frame, textvariable=self.base_timezone, state="readonly", width=20)
+        self.base_timezone_dropdown.grid(row=0, column=1, padx=5)
         
         # Populate dropdown with cities
-        timezone_dropdown['values'] = [city["name"] for city in self.cities]
-        timezone_dropdown.current(0)  # Set default to first city
+        self.base_timezone_dropdown['values'] = [city["name"] for city in self.cities]
+        self.base_timezone_dropdown.current(0)  # Set default to first city
         
         # Calculate button
         calc_button = ttk.Button(top_frame, text="Calculate Meeting Times", command=self.calculate_meeting_times)
         calc_button.pack(side=tk.LEFT, padx=20)
         
+        # Best-slot search over several days
+        search_frame = ttk.Frame(parent)
+        search_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.search_days = tk.StringVar(value="7")
+        self.search_slot = tk.StringVar(value="30")
+        self.search_duration = tk.StringVar(value="60")
+        
+        ttk.Label(search_frame, text="Search Days:").pack(side=tk.LEFT)
+        ttk.Spinbox(search_frame, from_=1, to=90, textvariable=self.search_days, width=4).pack(side=tk.LEFT, padx=(2, 15))
+        ttk.Label(search_frame, text="Slot (min):").pack(side=tk.LEFT)
+        ttk.Combobox(search_frame, textvariable=self.search_slot, values=["15", "30", "60"],
+                     state="readonly", width=4).pack(side=tk.LEFT, padx=(2, 15))
+        ttk.Label(search_frame, text="Duration (min):").pack(side=tk.LEFT)
+        ttk.Spinbox(search_frame, from_=15, to=480, increment=15, textvariable=self.search_duration,
+                    width=4).pack(side=tk.LEFT, padx=(2, 15))
+        ttk.Button(search_frame, text="Find Best Times", command=self.find_best_meeting_times).pack(side=tk.LEFT, padx=5)
+        
         # Results area
         results_frame = ttk.LabelFrame(parent, text="Meeting Times Across Timezones")
         results_frame.pack(fill=tk.BOTH, expand=True, pady=10)
@@ -292,8 +852,9 @@ class GlobalTimeApp:
                 raise ValueError("Base city not found")
                 
             # Create datetime in the base timezone
-            base_tz = pytz.timezone(base_city["timezone"])
+            base_tz = self.tz_registry.get(base_city["timezone"])
             meeting_datetime = base_tz.localize(datetime.datetime(year, month, day, hour, minute))
+            meeting_ts = meeting_datetime.timestamp()
             
             # Display title with meeting info
             title = f"Meeting at {meeting_datetime.strftime('%Y-%m-%d %H:%M')} {base_city_name} time"
@@ -313,8 +874,7 @@ class GlobalTimeApp:
             
             # Calculate and display time for each city
             for i, city in enumerate(self.cities):
-                city_tz = pytz.timezone(city["timezone"])
-                local_time = meeting_datetime.astimezone(city_tz)
+                local_time = self.tz_registry.local_time(city["timezone"], meeting_ts)
                 
                 # Check if within working hours (9 AM to 5 PM)
                 hour = local_time.hour
@@ -358,129 +918,221 @@ class GlobalTimeApp:
                                    foreground="red")
             error_label.pack(pady=20)
     
+    def best_meeting_slots(self, base_timezone, start_date, days=7, slot_minutes=30, duration_minutes=60, top=10):
+        """Rank meeting start times over `days` days from midnight of start_date in base_timezone"""
+        base_tz = self.tz_registry.get(base_timezone)
+        start = base_tz.localize(datetime.datetime.combine(start_date, datetime.time()))
+        planner = MeetingPlanner(self.tz_registry)
+        tz_names = [city["timezone"] for city in self.cities]
+        slots = planner.best_slots(tz_names, start.timestamp(), days, slot_minutes, duration_minutes, top)
+        
+        for slot in slots:
+            slot["local"] = self.tz_registry.local_time(base_timezone, slot["start"])
+            slot["outside"] = [city["name"] for i, city in enumerate(self.cities) if i not in slot["cities"]]
+            slot["cities"] = [self.cities[i]["name"] for i in slot["cities"]]
+        return slots
+        
+    def find_best_meeting_times(self):
+        """Search the selected range for slots that suit the most cities"""
+        for widget in self.meeting_results_frame.winfo_children():
+            widget.destroy()
+            
+        try:
+            start_date = datetime.date(int(self.meeting_year.get()), int(self.meeting_month.get()),
+                                       int(self.meeting_day.get()))
+            base_city_name = self.base_timezone.get()
+            base_city = next((city for city in self.cities if city["name"] == base_city_name), None)
+            if not base_city:
+                raise ValueError("Base city not found")
+                
+            duration = int(self.search_duration.get())
+            slots = self.best_meeting_slots(base_city["timezone"], start_date, int(self.search_days.get()),
+                                            int(self.search_slot.get()), duration)
+            
+            title = f"Best {duration}-minute slots ({base_city_name} time)"
+            ttk.Label(self.meeting_results_frame, text=title, font=("Arial", 12, "bold")).pack(pady=(10, 20))
+            
+            grid_frame = ttk.Frame(self.meeting_results_frame)
+            grid_frame.pack(fill=tk.BOTH, expand=True)
+            
+            for col, header in enumerate(["Start", "Cities In Hours", "Outside Hours"]):
+                ttk.Label(grid_frame, text=header, font=("Arial", 11, "bold")).grid(row=0, column=col, padx=10, pady=5, sticky=tk.W)
+            ttk.Separator(grid_frame, orient='horizontal').grid(row=1, column=0, columnspan=3, sticky='ew', pady=5)
+            
+            for i, slot in enumerate(slots):
+                outside = slot["outside"]
+                ttk.Label(grid_frame, text=slot["local"].strftime("%a %Y-%m-%d %H:%M")).grid(row=i+2, column=0, padx=10, pady=5, sticky=tk.W)
+                ttk.Label(grid_frame, text=f"{slot['available']}/{len(self.cities)}").grid(row=i+2, column=1, padx=10, pady=5, sticky=tk.W)
+                ttk.Label(grid_frame, text=", ".join(outside) or "-").grid(row=i+2, column=2, padx=10, pady=5, sticky=tk.W)
+                
+        except Exception as e:
+            error_label = ttk.Label(self.meeting_results_frame,
+                                   text=f"Error finding meeting times: {str(e)}",
+                                   foreground="red")
+            error_label.pack(pady=20)
+    
+    # Columns of the settings list, in display order
+    SETTINGS_COLUMNS = ("favorite", "name", "timezone", "color")
+    
     def setup_settings(self, parent):
         """Set up settings tab"""
         # Instructions
-        ttk.Label(parent, text="Customize cities and timezones").pack(anchor=tk.W, pady=(0, 10))
+        ttk.Label(parent, text="Customize cities and timezones (double-click a cell to edit)").pack(anchor=tk.W, pady=(0, 10))
         
-        # Create scrollable frame for city settings
-        canvas = tk.Canvas(parent)
-        scrollbar = ttk.Scrollbar(parent, orient="vertical", command=canvas.yview)
-        settings_frame = ttk.Frame(canvas)
+        # Buttons
+        button_frame = ttk.Frame(parent)
+        button_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=10)
         
-        settings_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(
-                scrollregion=canvas.bbox("all")
-            )
-        )
+        # Type a city, country or abbreviation to search for its timezone
+        ttk.Label(button_frame, text="Find:").pack(side=tk.LEFT, padx=(5, 0))
+        self.city_search = tk.StringVar()
+        self.city_search_box = ttk.Combobox(button_frame, textvariable=self.city_search, width=30)
+        self.city_search_box.pack(side=tk.LEFT, padx=5)
+        self.city_search_box.bind("<KeyRelease>", self.update_city_search)
+        self.city_search_box.bind("<Return>", lambda e: self.add_city())
+        self.city_search_results = {}
+        
+        ttk.Button(button_frame, text="Add New City", command=self.add_city).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Delete Selected", command=self.delete_city).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="Save Settings", command=self.save_settings_from_ui).pack(side=tk.RIGHT, padx=5)
+        
+        # One row per city; Tk only draws the rows that are visible
+        list_frame = ttk.Frame(parent)
+        list_frame.pack(fill=tk.BOTH, expand=True)
         
-        canvas.create_window((0, 0), window=settings_frame, anchor="nw")
-        canvas.configure(yscrollcommand=scrollbar.set)
+        self.city_tree = ttk.Treeview(list_frame, columns=self.SETTINGS_COLUMNS, show="headings", selectmode="extended")
+        scrollbar = ttk.Scrollbar(list_frame, orient="vertical", command=self.city_tree.yview)
+        self.city_tree.configure(yscrollcommand=scrollbar.set)
         
-        canvas.pack(side="left", fill="both", expand=True)
+        for column, heading, width in zip(self.SETTINGS_COLUMNS,
+                                          ("Favorite", "City Name", "Timezone", "Display Color"),
+                                          (70, 160, 220, 130)):
+            self.city_tree.heading(column, text=heading)
+            self.city_tree.column(column, width=width, anchor=tk.CENTER if column == "favorite" else tk.W)
+        
+        self.city_tree.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
         
-        # Column headers
-        headers_frame = ttk.Frame(settings_frame)
-        headers_frame.pack(fill=tk.X, pady=(0, 5))
-        
-        ttk.Label(headers_frame, text="Favorite", width=8).pack(side=tk.LEFT, padx=5)
-        ttk.Label(headers_frame, text="City Name", width=15).pack(side=tk.LEFT, padx=5)
-        ttk.Label(headers_frame, text="Timezone", width=20).pack(side=tk.LEFT, padx=5)
-        ttk.Label(headers_frame, text="Display Color", width=15).pack(side=tk.LEFT, padx=5)
-        
-        ttk.Separator(settings_frame, orient='horizontal').pack(fill=tk.X, pady=5)
-        
-        # City settings
-        self.city_vars = []
-        for i, city in enumerate(self.cities):
-            city_frame = ttk.Frame(settings_frame)
-            city_frame.pack(fill=tk.X, pady=2)
-            
-            # Favorite checkbox
-            fav_var = tk.BooleanVar(value=city.get("favorite", False))
-            fav_check = ttk.Checkbutton(city_frame, variable=fav_var)
-            fav_check.pack(side=tk.LEFT, padx=5)
-            
-            # City name entry
-            name_var = tk.StringVar(value=city["name"])
-            name_entry = ttk.Entry(city_frame, textvariable=name_var, width=15)
-            name_entry.pack(side=tk.LEFT, padx=5)
-            
-            # Timezone selection (read-only dropdown)
-            tz_var = tk.StringVar(value=city["timezone"])
-            tz_dropdown = ttk.Combobox(city_frame, textvariable=tz_var, width=20)
-            tz_dropdown['values'] = sorted(pytz.all_timezones)
-            tz_dropdown.pack(side=tk.LEFT, padx=5)
-            
-            # Color selection (using simple dropdown for common colors)
-            colors = {
-                "Blue": "#3498db", 
-                "Red": "#e74c3c", 
-                "Green": "#2ecc71", 
-                "Orange": "#f39c12", 
-                "Purple": "#9b59b6", 
-                "Teal": "#1abc9c", 
-                "Dark Orange": "#d35400", 
-                "Dark Red": "#c0392b", 
-                "Gray": "#7f8c8d", 
-                "Dark Green": "#27ae60"
-            }
+        # Editors are created once and moved over whichever cell is being edited
+        self.editor_vars = {field: tk.StringVar() for field in ("name", "timezone", "color")}
+        self.cell_editors = {
+            "name": ttk.Entry(self.city_tree, textvariable=self.editor_vars["name"]),
+            "timezone": ttk.Combobox(self.city_tree, textvariable=self.editor_vars["timezone"],
+                                     values=self.tz_registry.all_names()),
+            "color": ttk.Combobox(self.city_tree, textvariable=self.editor_vars["color"],
+                                  values=list(COLORS), state="readonly")
+        }
+        for editor in self.cell_editors.values():
+            editor.bind("<Return>", self.finish_edit)
+            editor.bind("<Escape>", lambda e: self.finish_edit(commit=False))
+        self.cell_editors["name"].bind("<FocusOut>", self.finish_edit)
+        self.cell_editors["timezone"].bind("<KeyRelease>", self.filter_timezone_editor)
+        for field in ("timezone", "color"):
+            self.cell_editors[field].bind("<<ComboboxSelected>>", self.finish_edit)
+        self.editing = None
+        
+        self.city_tree.bind("<Double-1>", self.begin_edit)
+        for sequence in ("<Button-1>", "<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.city_tree.bind(sequence, self.finish_edit, add="+")
+        
+        # City data by tree row id
+        self.city_rows = {}
+        for city in self.cities:
+            self.insert_city_row(city)
             
-            color_var = tk.StringVar()
-            # Find color name by its hex value
-            for color_name, hex_code in colors.items():
-                if hex_code == city.get("color"):
-                    color_var.set(color_name)
-                    break
-            else:
-                color_var.set("Blue")  # default
-                
-            color_dropdown = ttk.Combobox(city_frame, textvariable=color_var, width=15)
-            color_dropdown['values'] = list(colors.keys())
-            color_dropdown.pack(side=tk.LEFT, padx=5)
-            
-            # Delete button
-            delete_btn = ttk.Button(city_frame, text="X", width=3,
-                                    command=partial(self.delete_city, i))
-            delete_btn.pack(side=tk.LEFT, padx=5)
-            
-            # Store variables
-            self.city_vars.append({
-                "favorite": fav_var,
-                "name": name_var,
-                "timezone": tz_var,
-                "color": color_var,
-                "colors_dict": colors,
-                "row": i
-            })
-        
-        # Add new city button
-        add_frame = ttk.Frame(settings_frame)
-        add_frame.pack(fill=tk.X, pady=10)
-        
-        add_btn = ttk.Button(add_frame, text="Add New City", command=self.add_city)
-        add_btn.pack(side=tk.LEFT, padx=5)
-        
-        # Save settings button
-        save_btn = ttk.Button(settings_frame, text="Save Settings", command=self.save_settings_from_ui)
-        save_btn.pack(pady=20)
-        
-    def delete_city(self, index):
-        """Delete a city from settings"""
-        if len(self.city_vars) > 1:  # Prevent deleting all cities
-            # Prepare to delete from GUI list
-            del self.city_vars[index]
-            
-            # Rebuild the settings tab
-            self.save_settings_from_ui()
+    def settings_row_values(self, city):
+        """Text shown in the settings list for a city"""
+        color_name = next((name for name, hex_code in COLORS.items() if hex_code == city.get("color")), "Blue")
+        return ("\u2605" if city.get("favorite", False) else "", city["name"], city["timezone"], color_name)
+        
+    def insert_city_row(self, city):
+        """Add one city to the settings list"""
+        iid = self.city_tree.insert("", tk.END, values=self.settings_row_values(city))
+        self.city_rows[iid] = dict(city)
+        return iid
+        
+    def begin_edit(self, event):
+        """Edit the cell under the pointer; favorites toggle instead"""
+        iid = self.city_tree.identify_row(event.y)
+        column = self.city_tree.identify_column(event.x)
+        if not iid or not column:
+            return
+        field = self.SETTINGS_COLUMNS[int(column[1:]) - 1]
+        city = self.city_rows[iid]
+        
+        if field == "favorite":
+            city["favorite"] = not city.get("favorite", False)
+            self.city_tree.item(iid, values=self.settings_row_values(city))
+            self.schedule_save()
+            return
+            
+        bbox = self.city_tree.bbox(iid, column)
+        if not bbox:
+            return
+        value = self.settings_row_values(city)[self.SETTINGS_COLUMNS.index(field)]
+        self.editor_vars[field].set(value)
+        
+        editor = self.cell_editors[field]
+        x, y, width, height = bbox
+        editor.place(x=x, y=y, width=width, height=height)
+        editor.focus_set()
+        self.editing = (iid, field)
+        
+    def finish_edit(self, event=None, commit=True):
+        """Hide the cell editor, storing its value in the city row"""
+        if not self.editing:
+            return
+        iid, field = self.editing
+        value = self.editor_vars[field].get().strip()
+        
+        if commit and field == "timezone" and value not in pytz.all_timezones_set:
+            self.root.bell()
+            return
             
-            # Rebuild settings tab to reflect changes
-            self.refresh_settings_tab()
+        self.editing = None
+        self.cell_editors[field].place_forget()
+        if not commit or not value or not self.city_tree.exists(iid):
+            return
+            
+        city = self.city_rows[iid]
+        city[field] = COLORS.get(value, "#3498db") if field == "color" else value
+        self.city_tree.item(iid, values=self.settings_row_values(city))
+        self.schedule_save()
+    
+    def update_city_search(self, event=None):
+        """Refresh the search box choices as the user types"""
+        if event is not None and event.keysym in ("Return", "Up", "Down", "Escape"):
+            return
+        results = self.timezone_index().search(self.city_search.get())
+        self.city_search_results = {f"{label} ({name})": (label, name) for label, name in results}
+        self.city_search_box['values'] = list(self.city_search_results)
+        
+    def filter_timezone_editor(self, event):
+        """Narrow the timezone editor to matching zones; an empty box lists all of them"""
+        if event.keysym in ("Return", "Up", "Down", "Escape"):
+            return
+        query = self.editor_vars["timezone"].get()
+        if query:
+            values = list(dict.fromkeys(name for _, name in self.timezone_index().search(query, 20)))
         else:
+            values = self.tz_registry.all_names()
+        self.cell_editors["timezone"]['values'] = values
+        
+    def delete_city(self):
+        """Delete the selected cities from settings"""
+        selected = self.city_tree.selection()
+        if not selected:
+            return
+        if len(selected) >= len(self.city_rows):  # Prevent deleting all cities
             from tkinter import messagebox
             messagebox.showwarning("Cannot Delete", "You must keep at least one city.")
+            return
+            
+        self.finish_edit(commit=False)
+        for iid in selected:
+            self.city_tree.delete(iid)
+            del self.city_rows[iid]
+        self.schedule_save()
     
     def add_city(self):
         """Add a new city to settings"""
@@ -492,99 +1144,179 @@ class GlobalTimeApp:
             "favorite": False
         }
         
-        # Add to in-memory cities
-        self.cities.append(new_city)
+        # Use the search box's choice, or its best match
+        query = self.city_search.get().strip()
+        if query:
+            match = self.city_search_results.get(query)
+            if match is None:
+                results = self.timezone_index().search(query, 1)
+                match = results[0] if results else None
+            if match:
+                new_city["name"], new_city["timezone"] = match
+            self.city_search.set("")
         
-        # Refresh UI
-        self.refresh_settings_tab()
+        self.finish_edit()
+        iid = self.insert_city_row(new_city)
+        self.city_tree.selection_set(iid)
+        self.city_tree.see(iid)
+        self.schedule_save()
     
+    def schedule_save(self):
+        """Save the settings list once edits pause, coalescing rapid changes"""
+        if self.save_job is not None:
+            self.root.after_cancel(self.save_job)
+        self.save_job = self.root.after(self.SAVE_DELAY_MS, self.save_settings_from_ui)
+        
     def save_settings_from_ui(self):
         """Save settings from UI elements"""
-        updated_cities = []
-        
-        for i, vars in enumerate(self.city_vars):
-            color_name = vars["color"].get()
-            color_hex = vars["colors_dict"].get(color_name, "#3498db")
-            
-            city = {
-                "name": vars["name"].get(),
-                "timezone": vars["timezone"].get(),
-                "color": color_hex,
-                "favorite": vars["favorite"].get()
-            }
-            updated_cities.append(city)
+        self.finish_edit()
+        if self.save_job is not None:
+            self.root.after_cancel(self.save_job)
+            self.save_job = None
+        updated_cities = [dict(self.city_rows[iid]) for iid in self.city_tree.get_children()]
             
         # Update settings
         self.cities = updated_cities
         self.save_settings(updated_cities)
         
-        # Refresh time display
+        # Refresh time display and the planner's base city choices
         self.refresh_time_display()
+        self.base_timezone_dropdown['values'] = [city["name"] for city in self.cities]
     
-    def refresh_settings_tab(self):
-        """Refresh the settings tab to reflect current settings"""
-        # Find and destroy the settings tab
-        for i in range(self.notebook.index("end")):
-            if self.notebook.tab(i, "text") == "Settings":
-                settings_tab = self.notebook.winfo_children()[i]
-                settings_tab.destroy()
-                
-                # Create new settings tab
-                new_settings_tab = ttk.Frame(self.notebook, padding=10)
-                self.notebook.insert(i, new_settings_tab, text="Settings")
-                
-                # Set up the tab
-                self.setup_settings(new_settings_tab)
-                
-                # Switch to the new tab
-                self.notebook.select(i)
-                
-                break
+    def watch_settings_file(self):
+        """Reload the settings if the file changed outside the app"""
+        # Local edits that are being made or waiting to be saved take precedence
+        try:
+            if self.editing is None and self.save_job is None and self.settings_store.changed():
+                # A file that doesn't parse yet is retried on the next check
+                cities = self.settings_store.load()
+                if cities:
+                    self.apply_settings(cities)
+        except Exception as e:
+            print(f"Error applying settings: {e}")
+        finally:
+            self.watch_job = self.root.after(self.WATCH_INTERVAL_MS, self.watch_settings_file)
+        
+    def apply_settings(self, cities):
+        """Show reloaded settings, updating only the rows and frames that changed"""
+        rows = list(self.city_tree.get_children())
+        for iid, city in zip(rows, cities):
+            if self.city_rows[iid] != city:
+                self.city_rows[iid] = dict(city)
+                self.city_tree.item(iid, values=self.settings_row_values(city))
+        for iid in rows[len(cities):]:
+            self.city_tree.delete(iid)
+            del self.city_rows[iid]
+        for city in cities[len(rows):]:
+            self.insert_city_row(city)
+            
+        self.cities = [dict(city) for city in cities]
+        self.refresh_time_display()
+        self.base_timezone_dropdown['values'] = [city["name"] for city in self.cities]
     
     def refresh_time_display(self):
-        """Refresh the main time display"""
-        # Find and destroy the main tab
-        for i in range(self.notebook.index("end")):
-            if self.notebook.tab(i, "text") == "Time Display":
-                main_tab = self.notebook.winfo_children()[i]
-                main_tab.destroy()
-                
-                # Create new main tab
-                new_main_tab = ttk.Frame(self.notebook, padding=10)
-                self.notebook.insert(i, new_main_tab, text="Time Display")
+        """Bring the time display in line with the favorite cities
+
+        Frames of cities that are still shown are kept, so only added and
+        removed cities create or destroy widgets.
+        """
+        existing = {}
+        for frame in self.time_frames:
+            existing.setdefault(frame["key"], []).append(frame)
+            
+        frames = []
+        for city in self.cities:
+            if not city.get("favorite", False):
+                continue
+            key = (city["name"], city["timezone"], city.get("color"))
+            reused = existing.get(key)
+            frames.append(reused.pop(0) if reused else self.create_time_frame(city))
+            
+        for unused in existing.values():
+            for frame in unused:
+                frame["container"].destroy()
                 
-                # Set up the tab
-                self.setup_time_display(new_main_tab)
+        # Repack in the new order, with separators between cities
+        for frame in frames:
+            frame["container"].pack_forget()
+        for i, frame in enumerate(frames):
+            frame["container"].pack(fill=tk.X)
+            if i < len(frames) - 1:
+                frame["separator"].pack(fill=tk.X, pady=10)
+            else:
+                frame["separator"].pack_forget()
                 
-                # Switch back to where we were
-                break
+        self.time_frames = frames
+        self.update_time()
     
     def update_time(self):
-        """Update all time displays with current time"""
+        """Update time displays, touching only labels whose text changed"""
+        ts = time.time()
         for frame in self.time_frames:
             city = frame["city"]
-            tz = pytz.timezone(city["timezone"])
-            now = datetime.datetime.now(tz)
+            try:
+                now = self.tz_registry.local_time(city["timezone"], ts)
+            except Exception as e:
+                # One bad zone must not stop the other clocks
+                if frame["time_text"] != "--:--:--":
+                    print(f"Error getting the time in {city['timezone']}: {e}")
+                    frame["time_label"].config(text="--:--:--")
+                    frame["time_text"] = "--:--:--"
+                continue
             
-            # Update time display
-            frame["time_label"].config(text=now.strftime("%H:%M:%S"))
-            frame["date_label"].config(text=now.strftime("%Y-%m-%d (%A)"))
+            time_text = now.strftime("%H:%M:%S")
+            if time_text != frame["time_text"]:
+                frame["time_label"].config(text=time_text)
+                frame["time_text"] = time_text
+                
+            # The date only changes at local midnight
+            if now.date() != frame["date"]:
+                frame["date_label"].config(text=now.strftime("%Y-%m-%d (%A)"))
+                frame["date"] = now.date()
     
-    def update_time_thread(self):
-        """Thread function to update time continuously"""
-        while self.running:
-            try:
-                self.root.after(0, self.update_time)
-                time.sleep(1)
-            except:
-                # Handle case where window was closed
-                break
+    def schedule_update(self):
+        """Schedule the next update just after the next wall-clock second boundary"""
+        delay_ms = 1000 - int(time.time() * 1000) % 1000 + 5
+        self.update_job = self.root.after(delay_ms, self.tick)
+        
+    def tick(self):
+        """One clock update on the Tk main loop"""
+        self.update_job = None
+        if not self.running:
+            return
+        try:
+            self.update_time()
+        finally:
+            # Keep the clock running even if one update fails
+            self.schedule_update()
+        
+    def cancel_update(self):
+        """Cancel the pending clock update, if any"""
+        if self.update_job is not None:
+            self.root.after_cancel(self.update_job)
+            self.update_job = None
+    
+    def on_unmap(self, event):
+        """Pause updates while the window is minimized"""
+        # Child widgets share the toplevel's bindings; only react to the window itself
+        if event.widget is self.root:
+            self.cancel_update()
+            
+    def on_map(self, event):
+        """Resume updates when the window is restored"""
+        if event.widget is self.root and self.running and self.update_job is None:
+            self.update_time()
+            self.schedule_update()
     
     def on_closing(self):
         """Handle window closing"""
         self.running = False
-        if self.update_thread:
-            self.update_thread.join(0.1)  # Give thread time to clean up
+        self.cancel_update()
+        if self.watch_job is not None:
+            self.root.after_cancel(self.watch_job)
+        # Write out edits still waiting for their debounce
+        if self.save_job is not None:
+            self.save_settings_from_ui()
         self.root.destroy()
     
     def run(self):
@@ -597,6 +1329,27 @@ class GlobalTimeApp:
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Global Time Dashboard")
     parser.add_argument('--cli', action='store_true', help="Show times in command line instead of GUI")
+    parser.add_argument('--find', metavar="QUERY", help="Search timezones by city, country or abbreviation")
+    parser.add_argument('--plan', action='store_true', help="List the best meeting slots for the configured cities")
+    parser.add_argument('--base', default=None, help="Base city for --plan (default: first city)")
+    parser.add_argument('--start', default=None, help="First day to search for --plan, YYYY-MM-DD (default: today)")
+    parser.add_argument('--days', type=int, default=7, help="Number of days to search for --plan")
+    parser.add_argument('--slot-minutes', type=int, default=30, help="Slot granularity for --plan")
+    parser.add_argument('--duration', type=int, default=60, help="Meeting length in minutes for --plan")
+    parser.add_argument('--top', type=int, default=10, help="Number of slots to list for --plan")
+    
+    subparsers = parser.add_subparsers(dest="command")
+    convert = subparsers.add_parser('convert', help="Convert a stream of timestamps to local times")
+    convert.add_argument('input', nargs='?', default='-', help="Input file (default: stdin)")
+    convert.add_argument('--format', choices=['auto', 'csv', 'jsonl', 'text'], default='auto',
+                         help="Input format; text is one timestamp per line (default: from extension or first line)")
+    convert.add_argument('--field', default='timestamp',
+                         help="CSV column or JSON field holding the timestamp (default: timestamp)")
+    convert.add_argument('--unit', choices=['auto', 's', 'ms', 'us', 'ns'], default='auto',
+                         help="Unit of numeric timestamps (default: guessed from magnitude)")
+    convert.add_argument('--cities', help="Comma-separated city names or timezones (default: all configured cities)")
+    convert.add_argument('--output', '-o', default='-', help="Output file (default: stdout)")
+    convert.add_argument('--chunk-size', type=int, default=100000, help="Rows converted per batch (fewer when converting for many cities)")
     return parser.parse_args()
 
 def display_cli_times(app):
@@ -604,20 +1357,172 @@ def display_cli_times(app):
     print("\n=== GLOBAL TIME DASHBOARD ===")
     print(f"Current local time: {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
     
+    ts = time.time()
     for city in app.cities:
         if city.get("favorite", True):  # Show favorites by default
-            tz = pytz.timezone(city["timezone"])
-            now = datetime.datetime.now(tz)
-            print(f"{city['name']:15} {now.strftime('%Y-%m-%d %H:%M:%S')} ({tz.zone})")
+            now = app.tz_registry.local_time(city["timezone"], ts)
+            print(f"{city['name']:15} {now.strftime('%Y-%m-%d %H:%M:%S')} ({city['timezone']})")
     
     print("\nUse --gui to launch the graphical interface")
 
+def display_cli_find(app, query):
+    """Print the timezones matching a search in the command line interface"""
+    results = app.timezone_index().search(query)
+    if not results:
+        print(f"No timezones match '{query}'")
+        return
+    ts = time.time()
+    for label, name in results:
+        now = app.tz_registry.local_time(name, ts)
+        offset = app.tz_registry.offset(name, ts)
+        sign = "+" if offset >= 0 else "-"
+        hours, minutes = divmod(abs(offset) // 60, 60)
+        print(f"{label:30} {name:32} UTC{sign}{hours:02d}:{minutes:02d}  {now.strftime('%H:%M')}")
+
+def detect_format(path, first_line):
+    """Guess the input format from the file extension or the first line"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return "csv"
+    if ext in (".jsonl", ".ndjson"):
+        return "jsonl"
+    if first_line.lstrip().startswith("{"):
+        return "jsonl"
+    # A lone name such as "timestamp" is the header of a single-column CSV;
+    # epoch numbers and ISO dates are never identifiers
+    return "csv" if "," in first_line or first_line.strip().isidentifier() else "text"
+
+def csv_line(fields, tail=None):
+    """One CSV record; fields are quoted only when they contain special characters"""
+    line = ",".join(fields)
+    if '"' in line or "\n" in line or "\r" in line or line.count(",") != len(fields) - 1:
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="").writerow(fields)
+        line = buffer.getvalue()
+    return f"{line},{tail}\n" if tail is not None else line + "\n"
+
+# Upper bound on rows x cities converted at once, which bounds memory for many cities
+CONVERT_CELL_BUDGET = 500000
+
+def read_records(lines):
+    """JSON objects from JSONL lines, with None for lines that aren't one"""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            record = None
+        yield record if isinstance(record, dict) else None
+
+def convert_stream(app, args):
+    """Stream timestamps from a file or stdin and write local times for each city"""
+    cities = app.cities
+    if args.cities:
+        by_name = {city["name"]: city for city in app.cities}
+        cities = []
+        for name in (part.strip() for part in args.cities.split(",")):
+            if name in by_name:
+                cities.append(by_name[name])
+            elif name in pytz.all_timezones_set:
+                cities.append({"name": name, "timezone": name})
+            else:
+                print(f"Unknown city or timezone: {name}", file=sys.stderr)
+                return 1
+                
+    converter = TimeConverter(app.tz_registry, [city["timezone"] for city in cities], args.unit)
+    names = [city["name"] for city in cities]
+    chunk_size = max(1, min(args.chunk_size, CONVERT_CELL_BUDGET // max(1, len(names))))
+    source = sys.stdin if args.input == '-' else open(args.input, newline='', encoding='utf-8')
+    target = sys.stdout if args.output == '-' else open(args.output, 'w', newline='', encoding='utf-8')
+    skipped = 0
+    bad_records = 0
+    
+    try:
+        first_line = source.readline()
+        lines = itertools.chain([first_line], source)
+        fmt = args.format if args.format != 'auto' else detect_format(args.input, first_line)
+        
+        if fmt == 'jsonl':
+            records = read_records(lines)
+            while True:
+                chunk = list(itertools.islice(records, chunk_size))
+                if not chunk:
+                    break
+                # Lines that aren't JSON objects are dropped, like unparseable timestamps
+                records_ok = [record for record in chunk if record is not None]
+                bad_records += len(chunk) - len(records_ok)
+                if not records_ok:
+                    continue
+                columns = converter.convert([record.get(args.field) for record in records_ok])
+                for i, record in enumerate(records_ok):
+                    record["local"] = {name: column[i] for name, column in zip(names, columns)}
+                target.write("\n".join(json.dumps(record) for record in records_ok) + "\n")
+                target.flush()
+                skipped += columns[0].count("") if columns else 0
+        else:
+            if fmt == 'csv':
+                rows = csv.reader(lines)
+                header = next(rows, [])
+                if args.field not in header:
+                    print(f"Unknown field '{args.field}'; the CSV header has: {', '.join(header)}", file=sys.stderr)
+                    return 1
+                column = header.index(args.field)
+                target.write(csv_line(header + names))
+            else:
+                rows = ([line.strip()] for line in lines if line.strip())
+                column = 0
+                target.write(csv_line(["timestamp"] + names))
+                
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    break
+                columns = converter.convert([row[column] if len(row) > column else "" for row in chunk])
+                # Local times never need quoting, so they are joined directly
+                target.write("".join(
+                    csv_line(row, ",".join(local)) for row, local in zip(chunk, zip(*columns))))
+                target.flush()
+                skipped += columns[0].count("") if columns else 0
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if target is not sys.stdout:
+            target.close()
+            
+    if bad_records:
+        print(f"Skipped {bad_records} lines that are not JSON objects", file=sys.stderr)
+    if skipped:
+        print(f"Skipped {skipped} unparseable timestamps", file=sys.stderr)
+    return 0
+
+def display_cli_plan(app, args):
+    """Print the best meeting slots in the command line interface"""
+    base_city = next((city for city in app.cities if city["name"] == args.base), app.cities[0])
+    if args.base and base_city["name"] != args.base:
+        print(f"Unknown city '{args.base}', using {base_city['name']}")
+    start_date = datetime.date.fromisoformat(args.start) if args.start else datetime.date.today()
+    
+    slots = app.best_meeting_slots(base_city["timezone"], start_date, args.days,
+                                   args.slot_minutes, args.duration, args.top)
+    print(f"\n=== BEST {args.duration}-MINUTE MEETING SLOTS ({base_city['name']} time) ===")
+    for slot in slots:
+        outside = slot["outside"]
+        print(f"{slot['local'].strftime('%a %Y-%m-%d %H:%M')}  {slot['available']}/{len(app.cities)} in hours"
+              + (f"  (outside: {', '.join(outside)})" if outside else ""))
+
 if __name__ == "__main__":
     args = parse_arguments()
     
     app = GlobalTimeApp()
     
-    if args.cli:
+    if args.command == 'convert':
+        sys.exit(convert_stream(app, args))
+    elif args.find:
+        display_cli_find(app, args.find)
+    elif args.plan:
+        display_cli_plan(app, args)
+    elif args.cli:
         display_cli_times(app)
     else:
         app.run() 
\ No newline at end of file
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+"""
+Import Time Benchmark
+---------------------
+Checks that the utilities start quickly for commands that don't need charts
+or analysis. Each module is imported in a fresh interpreter with
+`python -X importtime`; the script fails if the import takes longer than its
+budget or pulls in a heavy dependency that should only load on first use.
+"""
+
+import os
+import sys
+import subprocess
+import statistics
+import argparse
+
+# Module -> (import budget in milliseconds, top-level packages that must stay unloaded)
+BUDGETS = {
+    "keyboard_monitor": (150, ["matplotlib", "pandas", "numpy", "pynput", "tkinter"]),
+    "pomodoro_timer": (100, ["matplotlib", "tkinter"]),
+}
+
+def measure_import(module, tools_dir):
+    """Import module in a new interpreter; return (milliseconds, heavy modules loaded)"""
+    heavy = BUDGETS[module][1]
+    code = (
+        f"import {module}, sys; "
+        f"print(','.join(sorted({{m.split('.')[0] for m in sys.modules}} & {set(heavy)!r})))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=tools_dir, capture_output=True, text=True, check=True
+    )
+
+    # importtime lines look like: "import time:  self [us] | cumulative | module"
+    cumulative_us = 0
+    for line in result.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            cumulative_us = int(parts[1])
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return cumulative_us / 1000, loaded
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Check import time budgets of the utilities")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh imports per module")
+    return parser.parse_args()
+
+def main():
+    args = parse_arguments()
+    tools_dir = os.path.dirname(os.path.abspath(__file__))
+    failed = False
+
+    for module, (budget_ms, _) in BUDGETS.items():
+        timings = []
+        loaded = []
+        for _ in range(args.runs):
+            ms, loaded = measure_import(module, tools_dir)
+            timings.append(ms)
+        median_ms = statistics.median(timings)
+
+        status = "OK"
+        if median_ms > budget_ms:
+            status = "OVER BUDGET"
+            failed = True
+        if loaded:
+            status = f"LOADED {', '.join(loaded)} EAGERLY"
+            failed = True
+        print(f"{module:<20} {median_ms:7.1f} ms (budget {budget_ms} ms)  {status}")
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,103 +1,930 @@
-import pynput
-from pynput import keyboard
 import time
 import datetime
 import os
 import json
-import pandas as pd
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import tkinter as tk
-from tkinter import ttk
 import threading
 import atexit
+import signal
+import socket
 import argparse
 import sys
+import struct
+import gzip
+import shutil
+from array import array
+from collections import deque
+
+# zstd compression of closed logs is optional
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Heavy dependencies are imported on first use, so --start/--stop/--status
+# and other commands that never chart or analyse don't pay for them
+keyboard = None  # pynput.keyboard
+np = None
+pd = None
+tk = None
+ttk = None
+Figure = None
+FigureCanvasTkAgg = None
+
+def load_listener():
+    """Import pynput when monitoring actually starts"""
+    global keyboard
+    if keyboard is None:
+        from pynput import keyboard
+
+def load_analysis():
+    """Import numpy and pandas for multi-day history queries"""
+    global np, pd
+    if pd is None:
+        import numpy as np
+        import pandas as pd
+
+def load_gui():
+    """Import tkinter and the matplotlib Tk backend for the GUI"""
+    global tk, ttk, Figure, FigureCanvasTkAgg
+    if Figure is None:
+        import tkinter as tk
+        from tkinter import ttk
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+class KeystrokeJournal:
+    """Append-only binary log of one day's keystroke timestamps.
+
+    The file starts with a fixed-size header (start time, total count and the
+    24 hourly counters) followed by one little-endian int64 epoch-millisecond
+    record per keystroke. Saving appends only the new records and rewrites the
+    header in place, so a save costs O(new keystrokes) instead of O(day).
+    """
+
+    MAGIC = b"KBJ1"
+    HEADER = struct.Struct("<4sqq24q")
+    RECORD_SIZE = 8
+
+    def __init__(self, path, fsync_every=1000, fsync_interval=30.0):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self, since_ms=None):
+        """Read the journal header and the records newer than since_ms
+
+        Returns (start_ms, total_count, hourly_counts, first_index, timestamps),
+        where first_index is the position of timestamps[0] within the day.
+        """
+        with open(self.path, 'rb') as f:
+            header = f.read(self.HEADER.size)
+            if len(header) < self.HEADER.size:
+                raise ValueError(f"Truncated journal header in {self.path}")
+            magic, start_ms, total_count, *hourly = self.HEADER.unpack(header)
+            if magic != self.MAGIC:
+                raise ValueError(f"Not a keystroke journal: {self.path}")
+
+            # A partially written trailing record left by an interrupted save is ignored
+            size = os.fstat(f.fileno()).st_size - self.HEADER.size
+            record_count = size // self.RECORD_SIZE
+
+            # The header is rewritten after the records, so after a crash it may
+            # lag behind them; rebuild the counters from the records in that case
+            if total_count != record_count:
+                total_count = record_count
+                hourly = [0] * 24
+                for chunk in self.iter_chunks(f, 0, record_count):
+                    for ms in chunk:
+                        hourly[datetime.datetime.fromtimestamp(ms / 1000).hour] += 1
+
+            first_index = 0 if since_ms is None else self._bisect(f, since_ms, record_count)
+            timestamps = array('q')
+            for chunk in self.iter_chunks(f, first_index, record_count):
+                timestamps.extend(chunk)
+
+        return start_ms, total_count, hourly, first_index, timestamps
+
+    def _read_record(self, f, index):
+        f.seek(self.HEADER.size + index * self.RECORD_SIZE)
+        return struct.unpack("<q", f.read(self.RECORD_SIZE))[0]
+
+    def _bisect(self, f, ms, record_count):
+        """Index of the first record >= ms; records are written in time order"""
+        lo, hi = 0, record_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._read_record(f, mid) < ms:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def iter_chunks(self, f, start, stop, chunk_records=65536):
+        f.seek(self.HEADER.size + start * self.RECORD_SIZE)
+        while start < stop:
+            count = min(chunk_records, stop - start)
+            chunk = array('q')
+            chunk.frombytes(f.read(count * self.RECORD_SIZE))
+            if sys.byteorder == "big":
+                chunk.byteswap()
+            yield chunk
+            start += count
+
+    def create(self, start_ms, timestamps=(), hourly_counts=None):
+        """Write a fresh journal, replacing any existing file"""
+        self.close()
+        hourly = hourly_counts or [0] * 24
+        with open(self.path, 'wb') as f:
+            f.write(self.HEADER.pack(self.MAGIC, start_ms, len(timestamps), *hourly))
+            f.write(self._pack(timestamps))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def append(self, timestamps, start_ms, total_count, hourly_counts):
+        """Append new timestamps and update the header counters"""
+        f = self._open()
+        if timestamps:
+            f.seek(0, os.SEEK_END)
+            f.write(self._pack(timestamps))
+        f.seek(0)
+        f.write(self.HEADER.pack(self.MAGIC, start_ms, total_count, *hourly_counts))
+        f.flush()
+
+        # Batch fsyncs: only force data to disk every N records or T seconds
+        self._unsynced += len(timestamps)
+        if (self._unsynced >= self.fsync_every
+                or time.monotonic() - self._last_sync >= self.fsync_interval):
+            self.sync()
+
+    def sync(self):
+        """Force buffered journal writes to disk"""
+        if self._file:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._file:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, 'r+b')
+        return self._file
+
+    COMPRESSED_EXTENSIONS = {"gzip": ".gz", "zstd": ".zst"}
+
+    @classmethod
+    def compress(cls, path, method="gzip"):
+        """Compress a closed journal to path.gz / path.zst and remove the original"""
+        if method == "zstd" and zstandard is None:
+            method = "gzip"
+        target = path + cls.COMPRESSED_EXTENSIONS[method]
+        tmp_target = target + ".tmp"
+        with open(path, 'rb') as src:
+            if method == "zstd":
+                with open(tmp_target, 'wb') as dst:
+                    zstandard.ZstdCompressor().copy_stream(src, dst)
+            else:
+                with gzip.open(tmp_target, 'wb') as dst:
+                    shutil.copyfileobj(src, dst)
+        os.replace(tmp_target, target)
+        os.remove(path)
+        return target
+
+    @classmethod
+    def read_sequential(cls, path, chunk_records=65536):
+        """Yield record chunks from a plain or compressed journal, front to back"""
+        if path.endswith(".zst"):
+            if zstandard is None:
+                raise ValueError(f"zstandard is required to read {path}")
+            raw = open(path, 'rb')
+            f = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+        elif path.endswith(".gz"):
+            f = gzip.open(path, 'rb')
+        else:
+            f = open(path, 'rb')
+        with f:
+            header = f.read(cls.HEADER.size)
+            if len(header) < cls.HEADER.size or header[:4] != cls.MAGIC:
+                raise ValueError(f"Not a keystroke journal: {path}")
+            while True:
+                data = f.read(chunk_records * cls.RECORD_SIZE)
+                usable = len(data) - len(data) % cls.RECORD_SIZE
+                if not usable:
+                    break
+                chunk = array('q')
+                chunk.frombytes(data[:usable])
+                if sys.byteorder == "big":
+                    chunk.byteswap()
+                yield chunk
+
+    @staticmethod
+    def _pack(timestamps):
+        if not isinstance(timestamps, array):
+            timestamps = array('q', timestamps)
+        if sys.byteorder == "big":
+            timestamps = array('q', timestamps)
+            timestamps.byteswap()
+        return timestamps.tobytes()
+
+
+class KeystrokeBuffer:
+    """Bounded in-memory store of recent keystroke timestamps
+
+    Timestamps are kept as int64 epoch milliseconds in an array('q') (8 bytes
+    per keystroke). Indexes are absolute positions within the day, so records
+    that have been written to the journal and fall outside the retention
+    window can be dropped from memory without renumbering anything.
+    """
+
+    def __init__(self, retention_seconds=3600, chunk_size=4096, first_index=0, timestamps=None):
+        self.retention_ms = int(retention_seconds * 1000)
+        self.chunk_size = chunk_size
+        self.first_index = first_index
+        self.timestamps = timestamps if timestamps is not None else array('q')
+        # Bound method cached so the listener callback does a single call
+        self.append = self.timestamps.append
+
+    def __len__(self):
+        """Total number of keystrokes, including those spilled to disk"""
+        return self.first_index + len(self.timestamps)
+
+    def since(self, index):
+        """Timestamps from absolute position index onwards (must still be in memory)"""
+        return self.timestamps[max(index - self.first_index, 0):]
+
+    def trim(self, persisted_count, now_ms):
+        """Drop whole chunks that are both persisted and older than the retention window"""
+        cutoff = now_ms - self.retention_ms
+        removable = min(persisted_count - self.first_index, len(self.timestamps))
+        if removable < self.chunk_size:
+            return 0
+
+        # Records are in time order, so count the expired prefix in chunk steps
+        drop = 0
+        while (drop + self.chunk_size <= removable
+               and self.timestamps[drop + self.chunk_size - 1] < cutoff):
+            drop += self.chunk_size
+        if drop:
+            del self.timestamps[:drop]
+            self.first_index += drop
+        return drop
+
+
+class KeystrokeWriter(threading.Thread):
+    """Background thread that moves keystrokes from the listener to storage
+
+    The pynput callback only appends an integer timestamp to a deque and
+    sets a wake event if it isn't already set. deque append and popleft are
+    atomic, so the common path takes no lock. This thread drains the deque
+    in batches, updates the monitor's counters and appends to the journal,
+    so a slow disk never delays key delivery. When max_queue keystrokes are
+    waiting the listener blocks until there is room (backpressure), which
+    is counted in the metrics; keystrokes are never dropped.
+    """
+
+    FLUSH = object()
+    STOP = object()
+
+    def __init__(self, monitor, max_queue=10000, batch_size=1000, save_every=100, save_interval=5.0):
+        super().__init__(name="KeystrokeWriter", daemon=True)
+        self.monitor = monitor
+        self.pending = deque()
+        self.max_queue = max_queue
+        self.wake = threading.Event()
+        self.room = threading.Event()
+        self.batch_size = batch_size
+        self.save_every = save_every
+        self.save_interval = save_interval
+        self.metrics = {
+            "processed": 0,
+            "batches": 0,
+            "saves": 0,
+            "max_queue_depth": 0,
+            "backpressure_waits": 0,
+            "last_save_ms": 0.0
+        }
+
+    def submit(self, timestamp_ms):
+        """Queue a keystroke timestamp; called on the listener thread"""
+        if len(self.pending) >= self.max_queue:
+            self.metrics["backpressure_waits"] += 1
+            while len(self.pending) >= self.max_queue and self.is_alive():
+                self.room.clear()
+                if len(self.pending) < self.max_queue:
+                    break
+                self.room.wait(0.1)
+        self.pending.append(timestamp_ms)
+        # The writer clears the event before draining, so a keystroke appended
+        # while it is set is still picked up by that drain
+        if not self.wake.is_set():
+            self.wake.set()
+
+    def push_marker(self, marker, done):
+        self.pending.append((marker, done))
+        self.wake.set()
+
+    def flush(self, timeout=10.0):
+        """Wait until everything queued so far has been saved and synced"""
+        if not self.is_alive():
+            return False
+        done = threading.Event()
+        self.push_marker(self.FLUSH, done)
+        return done.wait(timeout)
+
+    def stop(self, timeout=10.0):
+        """Drain the queue, save with fsync and end the thread"""
+        if self.is_alive():
+            self.push_marker(self.STOP, None)
+            self.join(timeout)
+
+    def run(self):
+        unsaved = 0
+        last_save = time.monotonic()
+        while True:
+            if not self.pending:
+                self.wake.wait(self.save_interval)
+            self.wake.clear()
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.pending.popleft())
+                except IndexError:
+                    break
+            if batch:
+                self.room.set()
+                    
+            if batch:
+                self.metrics["batches"] += 1
+                depth = len(batch) + len(self.pending)
+                if depth > self.metrics["max_queue_depth"]:
+                    self.metrics["max_queue_depth"] = depth
+                    
+            for item in batch:
+                if not isinstance(item, tuple):
+                    self.monitor.record_keystroke(item)
+                    self.metrics["processed"] += 1
+                    unsaved += 1
+                    continue
+                    
+                # Control markers are handled after the keystrokes queued before them
+                marker, done = item
+                self.save(sync=True)
+                unsaved = 0
+                last_save = time.monotonic()
+                if marker is self.STOP:
+                    return
+                done.set()
+                
+            if unsaved and (unsaved >= self.save_every
+                            or time.monotonic() - last_save >= self.save_interval):
+                self.save()
+                unsaved = 0
+                last_save = time.monotonic()
+                
+            # Rotate at midnight even when nobody is typing
+            if not batch:
+                self.monitor.check_day_rollover()
+
+    def save(self, sync=False):
+        start = time.perf_counter()
+        self.monitor.save_data(sync=sync)
+        self.metrics["saves"] += 1
+        self.metrics["last_save_ms"] = (time.perf_counter() - start) * 1000
+
+
+class KeystrokeStats:
+    """Running aggregates over the keystroke stream
+
+    Every counter is updated as keystrokes are recorded, so statistics
+    queries never rescan the keystroke history. Rolling keystrokes-per-minute
+    windows are kept as running sums over a per-second ring buffer.
+    """
+
+    WINDOWS = (1, 5, 15)  # minutes
+    RING_SECONDS = 15 * 60
+
+    def __init__(self, hourly_counts, start_ms, burst_factor=2.0, burst_min_kpm=60, idle_seconds=60):
+        self.hourly_counts = hourly_counts  # shared with the persisted data
+        self.minute_counts = array('l', [0] * 1440)
+        self.start_ms = start_ms
+        self.burst_factor = burst_factor
+        self.burst_min_kpm = burst_min_kpm
+        self.idle_seconds = idle_seconds
+        self.lock = threading.Lock()
+
+        self.total = sum(hourly_counts)
+        self.peak_hour = max(range(24), key=lambda h: hourly_counts[h])
+        self.peak_minute = 0
+        self.last_keystroke_ms = None
+        self.longest_idle_ms = 0
+        self.bursting = False
+        self.bursts = 0
+
+        # Local hour bucket, recomputed only when the hour boundary passes
+        self.current_hour = 0
+        self.hour_start_ms = 0
+        self.hour_end_ms = 0
+
+        self.ring = array('l', [0] * self.RING_SECONDS)
+        self.window_sums = {w: 0 for w in self.WINDOWS}
+        self.ring_second = None
+
+    def record(self, now_ms):
+        """Count one new keystroke"""
+        with self.lock:
+            self._record(now_ms, count_hour=True)
+
+    def seed(self, timestamps):
+        """Rebuild per-minute, idle, burst and rolling counters from already counted timestamps"""
+        with self.lock:
+            for ms in timestamps:
+                self._record(ms, count_hour=False)
+
+    def _record(self, now_ms, count_hour):
+        if now_ms >= self.hour_end_ms or now_ms < self.hour_start_ms:
+            self.update_hour_bucket(now_ms)
+
+        hour = self.current_hour
+        if count_hour:
+            self.total += 1
+            self.hourly_counts[hour] += 1
+            if self.hourly_counts[hour] > self.hourly_counts[self.peak_hour]:
+                self.peak_hour = hour
+        minute = hour * 60 + (now_ms - self.hour_start_ms) // 60000
+        self.minute_counts[minute] += 1
+        if self.minute_counts[minute] > self.minute_counts[self.peak_minute]:
+            self.peak_minute = minute
+
+        if self.last_keystroke_ms is not None:
+            gap = now_ms - self.last_keystroke_ms
+            if gap > self.longest_idle_ms:
+                self.longest_idle_ms = gap
+        self.last_keystroke_ms = now_ms
+
+        self._advance(now_ms // 1000)
+        self.ring[self.ring_second % self.RING_SECONDS] += 1
+        for w in self.WINDOWS:
+            self.window_sums[w] += 1
+
+        bursting = self._is_bursting()
+        if bursting and not self.bursting:
+            self.bursts += 1
+        self.bursting = bursting
+
+    def update_hour_bucket(self, now_ms):
+        """Recompute the local hour and its bounds (handles DST shifts)"""
+        now = datetime.datetime.fromtimestamp(now_ms / 1000)
+        hour_start = now.replace(minute=0, second=0, microsecond=0)
+        self.current_hour = now.hour
+        self.hour_start_ms = int(hour_start.timestamp() * 1000)
+        self.hour_end_ms = self.hour_start_ms + 3600 * 1000
+
+    def _advance(self, second):
+        """Move the ring forward to second, expiring counts that leave each window"""
+        if self.ring_second is None or second - self.ring_second >= self.RING_SECONDS:
+            self.ring = array('l', [0] * self.RING_SECONDS)
+            self.window_sums = {w: 0 for w in self.WINDOWS}
+        elif second > self.ring_second:
+            for s in range(self.ring_second + 1, second + 1):
+                for w in self.WINDOWS:
+                    self.window_sums[w] -= self.ring[(s - w * 60) % self.RING_SECONDS]
+                self.ring[s % self.RING_SECONDS] = 0
+        else:
+            return
+        self.ring_second = second
+
+    def _is_bursting(self):
+        kpm_1 = self.window_sums[1]
+        kpm_15 = self.window_sums[15] / 15
+        return kpm_1 >= self.burst_min_kpm and kpm_1 >= self.burst_factor * kpm_15
+
+    def rolling_kpm(self, now_ms=None):
+        """Keystrokes per minute over the last 1, 5 and 15 minutes"""
+        now_ms = now_ms if now_ms is not None else time.time_ns() // 1_000_000
+        with self.lock:
+            self._advance(now_ms // 1000)
+            return {w: self.window_sums[w] / w for w in self.WINDOWS}
+
+    def snapshot(self, now_ms=None):
+        """All statistics, in the format returned by KeyboardMonitor.get_stats"""
+        now_ms = now_ms if now_ms is not None else time.time_ns() // 1_000_000
+        rolling = self.rolling_kpm(now_ms)
+        with self.lock:
+            total = self.total
+            duration = (now_ms - self.start_ms) / 3600000  # in hours
+            idle_ms = now_ms - self.last_keystroke_ms if self.last_keystroke_ms is not None else None
+            # A burst is over once the short window drops back down
+            bursting = self.bursting and self._is_bursting()
+            return {
+                "total_keystrokes": total,
+                "hourly_counts": dict(enumerate(self.hourly_counts)),
+                "peak_hour": (self.peak_hour, self.hourly_counts[self.peak_hour]),
+                "minute_counts": self.minute_counts.tolist(),
+                "peak_minute": (self.peak_minute, self.minute_counts[self.peak_minute]),
+                "duration_hours": duration,
+                "keystrokes_per_minute": total / (duration * 60) if duration > 0 else 0,
+                "kpm_1min": rolling[1],
+                "kpm_5min": rolling[5],
+                "kpm_15min": rolling[15],
+                "bursting": bursting,
+                "bursts": self.bursts,
+                "idle": idle_ms is None or idle_ms >= self.idle_seconds * 1000,
+                "idle_seconds": idle_ms / 1000 if idle_ms is not None else None,
+                "longest_idle_minutes": self.longest_idle_ms / 60000
+            }
+
+
+class KeystrokeHistory:
+    """Query engine over all daily logs in the log directory
+
+    Each day is rolled up into a per-minute histogram (1440 counts) that is
+    cached as a .npy file next to the logs and rebuilt only when the day's
+    log file is newer than its rollup. Multi-day queries then load a few KB
+    per day instead of every keystroke timestamp.
+    """
+
+    LOG_PREFIX = "keyboard_log_"
+    WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 
-class KeyboardMonitor:
     def __init__(self, log_dir="keyboard_logs"):
+        load_analysis()
+        self.log_dir = log_dir
+        self.cache_dir = os.path.join(log_dir, "rollups")
+        self._memory = {}  # day -> (source mtime, minute histogram)
+
+    # Log file extensions, in order of preference when a day has several
+    SOURCE_EXTENSIONS = (".bin", ".bin.gz", ".bin.zst", ".json")
+
+    def available_days(self):
+        """Log file of every day that has one, from a single directory listing"""
+        sources = {}
+        for name in os.listdir(self.log_dir):
+            if not name.startswith(self.LOG_PREFIX):
+                continue
+            rest = name[len(self.LOG_PREFIX):]
+            stem, ext = rest[:10], rest[10:]
+            if ext not in self.SOURCE_EXTENSIONS:
+                continue
+            try:
+                day = datetime.date.fromisoformat(stem)
+            except ValueError:
+                continue
+            current = sources.get(day)
+            if current is None or self.SOURCE_EXTENSIONS.index(ext) < self.SOURCE_EXTENSIONS.index(current[1]):
+                sources[day] = (os.path.join(self.log_dir, name), ext)
+        return {day: path for day, (path, _) in sorted(sources.items())}
+
+    def source_file(self, day):
+        """The journal for a day, or the legacy JSON log if no journal exists"""
+        for ext in self.SOURCE_EXTENSIONS:
+            path = os.path.join(self.log_dir, f"{self.LOG_PREFIX}{day.isoformat()}{ext}")
+            if os.path.exists(path):
+                return path
+        return None
+
+    def day_minutes(self, day, source=None):
+        """Per-minute keystroke counts for one day (zeros if there is no log)"""
+        source = source or self.source_file(day)
+        if source is None:
+            return np.zeros(1440, dtype=np.int32)
+        mtime = os.path.getmtime(source)
+
+        cached = self._memory.get(day)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        rollup_file = os.path.join(self.cache_dir, f"minutes_{day.isoformat()}.npy")
+        if os.path.exists(rollup_file) and os.path.getmtime(rollup_file) >= mtime:
+            minutes = np.load(rollup_file)
+        else:
+            minutes = self.build_rollup(day, source)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            tmp_file = rollup_file + ".tmp.npy"
+            np.save(tmp_file, minutes)
+            os.replace(tmp_file, rollup_file)
+
+        self._memory[day] = (mtime, minutes)
+        return minutes
+
+    def build_rollup(self, day, source):
+        """Scan one day's log once and bucket its keystrokes by local minute"""
+        if source.endswith(".json"):
+            with open(source, 'r') as f:
+                keystrokes = json.load(f).get("keystrokes", [])
+            minute_index = [
+                (t.hour * 60 + t.minute) for t in map(datetime.datetime.fromisoformat, keystrokes)
+            ]
+            return np.bincount(np.asarray(minute_index, dtype=np.int64), minlength=1440)[:1440].astype(np.int32)
+
+        midnight = datetime.datetime.combine(day, datetime.time())
+        next_midnight = midnight + datetime.timedelta(days=1)
+        fixed_offset = (midnight.astimezone().utcoffset() == next_midnight.astimezone().utcoffset())
+        midnight_ms = int(midnight.timestamp() * 1000)
+
+        minutes = np.zeros(1440, dtype=np.int64)
+        for chunk in KeystrokeJournal.read_sequential(source):
+            timestamps = np.frombuffer(chunk, dtype=np.int64)
+            if fixed_offset:
+                index = (timestamps - midnight_ms) // 60000
+            else:
+                # DST change on this day: fall back to per-record local time
+                local = [datetime.datetime.fromtimestamp(ms / 1000) for ms in chunk]
+                index = np.array([t.hour * 60 + t.minute for t in local], dtype=np.int64)
+            minutes += np.bincount(np.clip(index, 0, 1439), minlength=1440)
+        return minutes.astype(np.int32)
+
+    def range_minutes(self, start, end):
+        """Matrix of per-minute counts, one row per day in [start, end]"""
+        days = pd.date_range(start, end, freq="D").date
+        if len(days) == 0:
+            return days, np.zeros((0, 1440), dtype=np.int32)
+        # One listing finds every log; days without one are zeros without touching the disk
+        sources = self.available_days()
+        minutes = np.zeros((len(days), 1440), dtype=np.int32)
+        for i, day in enumerate(days):
+            if day in sources:
+                minutes[i] = self.day_minutes(day, sources[day])
+        return days, minutes
+
+    def hourly_frame(self, start, end):
+        """Keystrokes per hour, one row per day in [start, end]"""
+        days, minutes = self.range_minutes(start, end)
+        hourly = minutes.reshape(len(days), 24, 60).sum(axis=2)
+        return pd.DataFrame(hourly, index=pd.Index(days, name="date"), columns=range(24))
+
+    def weekday_hour_heatmap(self, start, end):
+        """Average keystrokes for each weekday x hour over the tracked days in range"""
+        hourly = self.hourly_frame(start, end)
+        hourly = hourly[hourly.sum(axis=1) > 0]
+        heatmap = hourly.groupby(pd.Index([d.weekday() for d in hourly.index])).mean()
+        heatmap = heatmap.reindex(range(7), fill_value=0.0)
+        heatmap.index = self.WEEKDAYS
+        return heatmap
+
+    def summary(self, start, end, percentiles=(50, 90, 99)):
+        """Daily totals and active-minute typing speed percentiles for [start, end]"""
+        days, minutes = self.range_minutes(start, end)
+        totals = minutes.sum(axis=1)
+        tracked = totals > 0
+        active_minutes = minutes[minutes > 0]
+        return {
+            "days": len(days),
+            "tracked_days": int(tracked.sum()),
+            "total_keystrokes": int(totals.sum()),
+            "daily_average": float(totals[tracked].mean()) if tracked.any() else 0.0,
+            "daily_percentiles": {
+                p: float(v) for p, v in zip(percentiles, np.percentile(totals[tracked], percentiles))
+            } if tracked.any() else {},
+            "kpm_percentiles": {
+                p: float(v) for p, v in zip(percentiles, np.percentile(active_minutes, percentiles))
+            } if active_minutes.size else {}
+        }
+
+
+class KeyboardMonitor:
+    def __init__(self, log_dir="keyboard_logs", retention_minutes=60, compress="gzip"):
         # Create logging directories
         self.log_dir = log_dir
         os.makedirs(self.log_dir, exist_ok=True)
         
-        # Current date for logging
-        self.today = datetime.datetime.now().strftime("%Y-%m-%d")
-        self.log_file = os.path.join(self.log_dir, f"keyboard_log_{self.today}.json")
+        # Keystroke timestamps older than this are only kept on disk
+        self.retention_seconds = retention_minutes * 60
         
-        # Load existing data or create new log structure
-        self.data = self.load_data()
+        # Closed days are compressed in the background ("gzip", "zstd" or None)
+        self.compress = compress
+        self.compress_threads = []
+        
+        # Open today's log; it is rotated automatically at local midnight
+        self.open_day(datetime.datetime.now())
+        self.compress_closed_days()
         
         # For keyboard monitoring
         self.listener = None
+        self.writer = None
         self.is_running = False
         self.start_time = None
         
         # For GUI
         self.root = None
-        self.stats_thread = None
+        self.stats_job = None
         
-        # Make sure to save when the program exits
-        atexit.register(self.save_data)
+        # Persistent chart, redrawn in place at most max_plot_fps times a second
+        self.figure = None
+        self.canvas = None
+        self.plot_axes = None
+        self.bars = None
+        self.plot_background = None
+        self.plot_counts = [0] * 24
+        self.max_plot_fps = 2
+        self.last_plot_draw = 0.0
+        self.redraw_job = None
+        
+        # Make sure queued keystrokes are saved when the program exits
+        atexit.register(self.flush_and_close)
+        
+    def open_day(self, now):
+        """Point logging at the day containing `now` and load its data"""
+        self.today = now.strftime("%Y-%m-%d")
+        self.log_file = os.path.join(self.log_dir, f"keyboard_log_{self.today}.bin")
+        self.legacy_log_file = os.path.join(self.log_dir, f"keyboard_log_{self.today}.json")
+        self.journal = KeystrokeJournal(self.log_file)
+        
+        next_midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time())
+        self.day_end_ms = self.to_epoch_ms(next_midnight)
+        
+        # Load existing data or create new log structure
+        self.data = self.load_data()
+        # Number of keystrokes already written to the journal
+        self.saved_count = len(self.data["keystrokes"])
+        
+        # Running statistics, replayed from the whole day so that the busiest
+        # minute, bursts and idle gaps don't restart with the process
+        self.stats = KeystrokeStats(
+            self.data["hourly_counts"],
+            self.to_epoch_ms(datetime.datetime.fromisoformat(self.data["start_time"]))
+        )
+        self.stats.seed(self.day_timestamps())
+        
+    def day_timestamps(self):
+        """Every keystroke timestamp of the current day, read from its journal"""
+        if self.journal.exists():
+            timestamps = array('q')
+            try:
+                for chunk in KeystrokeJournal.read_sequential(self.log_file):
+                    timestamps.extend(chunk)
+                return timestamps
+            except Exception as e:
+                print(f"Error reading {self.log_file}: {e}")
+        # Without a readable journal only the retained window is known
+        return self.data["keystrokes"].timestamps
+        
+    def check_day_rollover(self, now_ms=None):
+        """Rotate to a new log file once local midnight has passed"""
+        now_ms = now_ms if now_ms is not None else time.time_ns() // 1_000_000
+        if now_ms < self.day_end_ms:
+            return False
+            
+        closed_file = self.log_file
+        self.save_data(sync=True)
+        self.journal.close()
+        self.open_day(datetime.datetime.fromtimestamp(now_ms / 1000))
+        print(f"New day, logging to {self.log_file}")
+        
+        if self.compress:
+            self.compress_in_background([closed_file])
+        return True
+        
+    def compress_closed_days(self):
+        """Compress uncompressed journals of earlier days left from previous runs"""
+        if not self.compress:
+            return
+        closed = [
+            os.path.join(self.log_dir, name) for name in sorted(os.listdir(self.log_dir))
+            if name.startswith("keyboard_log_") and name.endswith(".bin")
+            and name != os.path.basename(self.log_file)
+        ]
+        if closed:
+            self.compress_in_background(closed)
+            
+    def compress_in_background(self, paths):
+        def compress_all():
+            for path in paths:
+                try:
+                    KeystrokeJournal.compress(path, self.compress)
+                except Exception as e:
+                    print(f"Error compressing {path}: {e}")
+                    
+        thread = threading.Thread(target=compress_all, name="LogCompressor")
+        thread.start()
+        self.compress_threads = [t for t in self.compress_threads if t.is_alive()] + [thread]
         
     def load_data(self):
         """Load existing data for today or create new log structure"""
-        if os.path.exists(self.log_file):
+        if self.journal.exists():
             try:
-                with open(self.log_file, 'r') as f:
-                    data = json.load(f)
-                    
-                # Make sure the structure is valid
-                if all(k in data for k in ["hourly_counts", "total_count", "start_time", "keystrokes"]):
-                    return data
+                since_ms = self.to_epoch_ms(datetime.datetime.now()) - self.retention_seconds * 1000
+                start_ms, total_count, hourly, first_index, timestamps = self.journal.load(since_ms)
+                return {
+                    "hourly_counts": hourly,
+                    "total_count": total_count,
+                    "start_time": datetime.datetime.fromtimestamp(start_ms / 1000).isoformat(),
+                    "keystrokes": KeystrokeBuffer(self.retention_seconds, first_index=first_index,
+                                                  timestamps=timestamps)
+                }
             except Exception as e:
                 print(f"Error loading data: {e}")
-                # If error, create new data structure
+                
+        data = self.load_legacy_data()
+        if data is None:
+            # Create new data structure
+            data = {
+                "hourly_counts": [0] * 24,  # Count per hour of day
+                "total_count": 0,
+                "start_time": datetime.datetime.now().isoformat(),
+                "keystrokes": KeystrokeBuffer(self.retention_seconds)  # Timestamps only, never the keys
+            }
+            
+        try:
+            self.journal.create(
+                self.to_epoch_ms(datetime.datetime.fromisoformat(data["start_time"])),
+                data["keystrokes"].timestamps,
+                data["hourly_counts"]
+            )
+        except Exception as e:
+            print(f"Error creating journal: {e}")
+        return data
         
-        # Create new data structure
-        return {
-            "hourly_counts": {str(i): 0 for i in range(24)},  # Count per hour of day
-            "total_count": 0,
-            "start_time": datetime.datetime.now().isoformat(),
-            "keystrokes": []  # We don't record actual keys, just timestamps
-        }
+    def load_legacy_data(self):
+        """Import today's JSON log written by older versions, if present"""
+        if not os.path.exists(self.legacy_log_file):
+            return None
+        try:
+            with open(self.legacy_log_file, 'r') as f:
+                data = json.load(f)
+                
+            # Make sure the structure is valid
+            if not all(k in data for k in ["hourly_counts", "total_count", "start_time", "keystrokes"]):
+                return None
+                
+            timestamps = array('q', (
+                self.to_epoch_ms(datetime.datetime.fromisoformat(ts)) for ts in data["keystrokes"]
+            ))
+            return {
+                "hourly_counts": [data["hourly_counts"].get(str(h), 0) for h in range(24)],
+                "total_count": len(timestamps),
+                "start_time": data["start_time"],
+                "keystrokes": KeystrokeBuffer(self.retention_seconds, timestamps=timestamps)
+            }
+        except Exception as e:
+            print(f"Error loading data: {e}")
+            return None
+            
+    @staticmethod
+    def to_epoch_ms(dt):
+        return int(dt.timestamp() * 1000)
         
-    def save_data(self):
-        """Save current data to log file"""
+    def save_data(self, sync=False):
+        """Append unsaved keystrokes to the journal"""
         if self.data:
             try:
-                with open(self.log_file, 'w') as f:
-                    json.dump(self.data, f, indent=2)
+                keystrokes = self.data["keystrokes"]
+                new_keystrokes = keystrokes.since(self.saved_count)
+                self.journal.append(
+                    new_keystrokes,
+                    self.to_epoch_ms(datetime.datetime.fromisoformat(self.data["start_time"])),
+                    self.data["total_count"],
+                    self.data["hourly_counts"]
+                )
+                self.saved_count += len(new_keystrokes)
+                if sync:
+                    self.journal.sync()
+                    
+                # Older chunks now live only in the journal
+                keystrokes.trim(self.saved_count, time.time_ns() // 1_000_000)
                 print(f"Data saved to {self.log_file}")
             except Exception as e:
                 print(f"Error saving data: {e}")
                 
     def on_press(self, key):
-        """Callback function for key press events"""
-        # Record the current time
-        current_time = datetime.datetime.now()
-        hour = current_time.hour
+        """Callback function for key press events (runs on the listener thread)"""
+        # Only hand the timestamp to the writer thread; never do I/O here
+        self.writer.submit(time.time_ns() // 1_000_000)
         
+    def record_keystroke(self, now_ms):
+        """Count one keystroke (called on the writer thread)"""
+        if now_ms >= self.day_end_ms:
+            self.check_day_rollover(now_ms)
+            
         # Update counters without recording the actual key
+        self.stats.record(now_ms)
         self.data["total_count"] += 1
-        self.data["hourly_counts"][str(hour)] = self.data["hourly_counts"].get(str(hour), 0) + 1
-        
-        # Add timestamp to keystrokes list (without the actual key pressed)
-        self.data["keystrokes"].append(current_time.isoformat())
         
-        # Save data periodically (every 100 keystrokes)
-        if self.data["total_count"] % 100 == 0:
-            self.save_data()
-            # Also update the GUI if it's running
-            if self.root and self.root.winfo_exists():
-                self.root.event_generate("<<UpdateStats>>", when="tail")
-    
+        # Add timestamp to keystrokes buffer (without the actual key pressed)
+        self.data["keystrokes"].append(now_ms)
+                
     def start_monitoring(self):
         """Start keyboard monitoring"""
         if not self.is_running:
             self.is_running = True
             self.start_time = datetime.datetime.now()
             
+            # Persistence runs on its own thread, fed by the listener
+            self.writer = KeystrokeWriter(self)
+            self.writer.start()
+            
             # Start listener in a non-blocking way
+            load_listener()
             self.listener = keyboard.Listener(on_press=self.on_press)
             self.listener.start()
             
@@ -112,42 +939,39 @@ class KeyboardMonitor:
                 self.listener.stop()
                 self.listener = None
                 
-            self.save_data()
+            self.flush_and_close()
             print("Keyboard monitoring stopped.")
             
-    def get_stats(self):
-        """Calculate statistics from the collected data"""
-        stats = {}
-        
-        # Calculate total keystrokes
-        stats["total_keystrokes"] = self.data["total_count"]
-        
-        # Calculate keystrokes per hour
-        hourly_counts = {int(h): c for h, c in self.data["hourly_counts"].items()}
-        stats["hourly_counts"] = hourly_counts
-        
-        # Find peak hour
-        if hourly_counts:
-            stats["peak_hour"] = max(hourly_counts.items(), key=lambda x: x[1])
+    def flush_and_close(self):
+        """Save everything still queued and sync the journal to disk"""
+        if self.writer and self.writer.is_alive():
+            # The writer drains its queue and saves with fsync before exiting
+            self.writer.stop()
         else:
-            stats["peak_hour"] = (0, 0)
+            self.save_data(sync=True)
             
-        # Calculate session duration
-        start_time = datetime.datetime.fromisoformat(self.data["start_time"])
-        end_time = datetime.datetime.now()
-        duration = (end_time - start_time).total_seconds() / 3600  # in hours
-        stats["duration_hours"] = duration
-        
-        # Calculate keystrokes per minute (if duration > 0)
-        if duration > 0:
-            stats["keystrokes_per_minute"] = stats["total_keystrokes"] / (duration * 60)
-        else:
-            stats["keystrokes_per_minute"] = 0
+    def flush(self):
+        """Save everything queued so far without stopping the writer"""
+        if self.writer and self.writer.is_alive():
+            return self.writer.flush()
+        self.save_data(sync=True)
+        return True
+            
+    def get_writer_metrics(self):
+        """Queue and batching metrics of the persistence thread"""
+        if not self.writer:
+            return {}
+        metrics = dict(self.writer.metrics)
+        metrics["queue_depth"] = len(self.writer.pending)
+        return metrics
             
-        return stats
+    def get_stats(self):
+        """Return statistics from the running aggregates (O(1), no rescans)"""
+        return self.stats.snapshot()
         
     def create_gui(self):
         """Create a GUI for displaying statistics"""
+        load_gui()
         self.root = tk.Tk()
         self.root.title("Keyboard Activity Monitor")
         self.root.geometry("800x600")
@@ -176,6 +1000,9 @@ class KeyboardMonitor:
         self.keystrokes_per_minute_label = ttk.Label(stats_frame, text="Keystrokes Per Minute: 0.0", style="Stat.TLabel")
         self.keystrokes_per_minute_label.pack(anchor="w", padx=10, pady=5)
         
+        self.rolling_kpm_label = ttk.Label(stats_frame, text="Typing Speed (1/5/15 min): 0 / 0 / 0 KPM", style="Stat.TLabel")
+        self.rolling_kpm_label.pack(anchor="w", padx=10, pady=5)
+        
         self.peak_hour_label = ttk.Label(stats_frame, text="Peak Hour: N/A", style="Stat.TLabel")
         self.peak_hour_label.pack(anchor="w", padx=10, pady=5)
         
@@ -201,9 +1028,6 @@ class KeyboardMonitor:
         self.refresh_button = ttk.Button(control_frame, text="Refresh Stats", command=self.update_stats_display)
         self.refresh_button.pack(side=tk.LEFT, padx=5)
         
-        # Bind custom event for updating stats
-        self.root.bind("<<UpdateStats>>", lambda e: self.update_stats_display())
-        
         # Create initial plot
         self.create_plot()
         
@@ -214,9 +1038,7 @@ class KeyboardMonitor:
         self.start_monitoring()
         
         # Start updating stats periodically
-        self.stats_thread = threading.Thread(target=self.periodic_stats_update)
-        self.stats_thread.daemon = True
-        self.stats_thread.start()
+        self.periodic_stats_update()
         
     def stop_from_gui(self):
         """Stop monitoring from GUI button"""
@@ -225,10 +1047,11 @@ class KeyboardMonitor:
         self.stop_monitoring()
         
     def periodic_stats_update(self):
-        """Update stats display periodically"""
-        while self.is_running and self.root and self.root.winfo_exists():
-            self.root.event_generate("<<UpdateStats>>", when="tail")
-            time.sleep(5)  # Update every 5 seconds
+        """Update stats display periodically from the Tk main loop"""
+        self.stats_job = None
+        if self.is_running and self.root and self.root.winfo_exists():
+            self.update_stats_display()
+            self.stats_job = self.root.after(5000, self.periodic_stats_update)  # Update every 5 seconds
             
     def update_stats_display(self):
         """Update the stats display in the GUI"""
@@ -237,6 +1060,11 @@ class KeyboardMonitor:
         # Update labels
         self.total_keystrokes_label.config(text=f"Total Keystrokes: {stats['total_keystrokes']}")
         self.keystrokes_per_minute_label.config(text=f"Keystrokes Per Minute: {stats['keystrokes_per_minute']:.1f}")
+        activity = " (burst)" if stats["bursting"] else " (idle)" if stats["idle"] else ""
+        self.rolling_kpm_label.config(
+            text=f"Typing Speed (1/5/15 min): {stats['kpm_1min']:.0f} / {stats['kpm_5min']:.0f} / "
+                 f"{stats['kpm_15min']:.0f} KPM{activity}"
+        )
         
         peak_hour, peak_count = stats["peak_hour"]
         peak_time = f"{peak_hour:02d}:00 - {peak_hour+1:02d}:00" if peak_count > 0 else "N/A"
@@ -245,25 +1073,29 @@ class KeyboardMonitor:
         self.duration_label.config(text=f"Monitoring Duration: {stats['duration_hours']:.2f} hours")
         
         # Update plot
-        self.create_plot()
+        self.create_plot(stats)
         
-    def create_plot(self):
-        """Create or update the hourly keystrokes plot"""
-        # Clear the plot frame
-        for widget in self.plot_frame.winfo_children():
-            widget.destroy()
-            
+    def create_plot(self, stats=None):
+        """Create the hourly keystrokes plot once, then update it in place"""
         # Get hourly data
-        stats = self.get_stats()
+        if stats is None:
+            stats = self.get_stats()
         hourly_counts = stats["hourly_counts"]
+        self.plot_counts = [hourly_counts.get(h, 0) for h in range(24)]
         
-        # Create a new figure
-        fig, ax = plt.subplots(figsize=(8, 4))
+        if self.figure is None:
+            self.build_plot()
+        self.request_plot_redraw()
         
-        # Plot data
-        hours = list(range(24))
-        counts = [hourly_counts.get(h, 0) for h in hours]
-        bars = ax.bar(hours, counts, color='steelblue')
+    def build_plot(self):
+        """Build the persistent figure, canvas and bar artists"""
+        # A bare Figure is not tracked by pyplot's figure manager, so nothing leaks
+        self.figure = Figure(figsize=(8, 4))
+        ax = self.figure.add_subplot(111)
+        self.plot_axes = ax
+        
+        # Bars are animated so they can be redrawn on top of a cached background
+        self.bars = ax.bar(range(24), self.plot_counts, color='steelblue', animated=True)
         
         # Add labels and formatting
         ax.set_xlabel('Hour of Day')
@@ -272,16 +1104,52 @@ class KeyboardMonitor:
         ax.set_xticks(range(0, 24, 2))
         ax.set_xticklabels([f'{h:02d}:00' for h in range(0, 24, 2)])
         ax.grid(axis='y', linestyle='--', alpha=0.7)
+        ax.set_ylim(0, 10)
+        
+        # Create canvas
+        self.canvas = FigureCanvasTkAgg(self.figure, master=self.plot_frame)
+        self.canvas.mpl_connect("draw_event", self.on_plot_draw)
+        self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.canvas.draw()
+        
+    def request_plot_redraw(self):
+        """Schedule a redraw, coalescing requests to stay within max_plot_fps"""
+        if self.redraw_job:
+            return
+        min_interval = 1.0 / self.max_plot_fps
+        delay = max(0.0, self.last_plot_draw + min_interval - time.monotonic())
+        self.redraw_job = self.root.after(int(delay * 1000), self.redraw_plot)
+        
+    def redraw_plot(self):
+        """Update bar heights in place, blitting unless the axis has to rescale"""
+        self.redraw_job = None
+        self.last_plot_draw = time.monotonic()
         
         # Highlight the current hour
         current_hour = datetime.datetime.now().hour
-        if 0 <= current_hour < 24:
-            bars[current_hour].set_color('red')
+        for hour, (bar, count) in enumerate(zip(self.bars, self.plot_counts)):
+            bar.set_height(count)
+            bar.set_color('red' if hour == current_hour else 'steelblue')
+            
+        # Rescaling changes ticks and gridlines, which needs a full draw
+        peak = max(self.plot_counts)
+        top = self.plot_axes.get_ylim()[1]
+        if peak > top or (peak > 10 and peak < top / 4):
+            self.plot_axes.set_ylim(0, max(10, peak * 1.25))
+            self.canvas.draw()  # on_plot_draw captures the new background
+        elif self.plot_background is not None:
+            self.canvas.restore_region(self.plot_background)
+            self.blit_bars()
+            
+    def on_plot_draw(self, event):
+        """Cache the static background after a full draw and paint the bars on it"""
+        self.plot_background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self.blit_bars()
         
-        # Create canvas
-        canvas = FigureCanvasTkAgg(fig, master=self.plot_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+    def blit_bars(self):
+        for bar in self.bars:
+            self.plot_axes.draw_artist(bar)
+        self.canvas.blit(self.figure.bbox)
         
     def run_gui(self):
         """Run the GUI application"""
@@ -292,15 +1160,23 @@ class KeyboardMonitor:
         
     def on_closing(self):
         """Handle window closing event"""
+        if self.stats_job:
+            self.root.after_cancel(self.stats_job)
+        if self.redraw_job:
+            self.root.after_cancel(self.redraw_job)
         if self.is_running:
             self.stop_monitoring()
-        self.save_data()
+        else:
+            self.save_data(sync=True)
         self.root.destroy()
         
-    def generate_report(self, output_file=None):
+    def generate_report(self, output_file=None, history_days=30):
         """Generate a text report of keyboard activity"""
         stats = self.get_stats()
         
+        # Flush today's keystrokes so the history rollup includes them
+        self.flush()
+        
         if not output_file:
             output_file = os.path.join(self.log_dir, f"keyboard_report_{self.today}.txt")
             
@@ -313,47 +1189,319 @@ class KeyboardMonitor:
             f.write("--- Statistics ---\n")
             f.write(f"Total Keystrokes: {stats['total_keystrokes']}\n")
             f.write(f"Average Keystrokes Per Minute: {stats['keystrokes_per_minute']:.1f}\n")
+            f.write(f"Bursts of Fast Typing: {stats['bursts']}\n")
+            f.write(f"Longest Idle Gap: {stats['longest_idle_minutes']:.1f} minutes\n")
             
             peak_hour, peak_count = stats["peak_hour"]
             peak_time = f"{peak_hour:02d}:00 - {peak_hour+1:02d}:00" if peak_count > 0 else "N/A"
-            f.write(f"Peak Activity Hour: {peak_time} ({peak_count} keystrokes)\n\n")
+            f.write(f"Peak Activity Hour: {peak_time} ({peak_count} keystrokes)\n")
+            f.write(f"Busiest Minute: {format_minute(*stats['peak_minute'])}\n\n")
             
             f.write("--- Hourly Breakdown ---\n")
             for hour in range(24):
                 count = stats["hourly_counts"].get(hour, 0)
                 f.write(f"{hour:02d}:00 - {hour+1:02d}:00: {count} keystrokes\n")
                 
+            if history_days > 0:
+                self.write_history_report(f, history_days)
+                
         print(f"Report generated: {output_file}")
         return output_file
 
+    def write_history_report(self, f, days):
+        """Append multi-day statistics for the last `days` days to a report"""
+        end = datetime.date.fromisoformat(self.today)
+        start = end - datetime.timedelta(days=days - 1)
+        history = KeystrokeHistory(self.log_dir)
+        summary = history.summary(start, end)
+        
+        f.write(f"\n--- Last {days} Days ---\n")
+        f.write(f"Days Tracked: {summary['tracked_days']} of {summary['days']}\n")
+        f.write(f"Total Keystrokes: {summary['total_keystrokes']}\n")
+        f.write(f"Average Keystrokes Per Tracked Day: {summary['daily_average']:.0f}\n")
+        for p, value in summary["daily_percentiles"].items():
+            f.write(f"Daily Keystrokes p{p}: {value:.0f}\n")
+        for p, value in summary["kpm_percentiles"].items():
+            f.write(f"Active-Minute Typing Speed p{p}: {value:.0f} KPM\n")
+            
+        if summary["tracked_days"]:
+            heatmap = history.weekday_hour_heatmap(start, end)
+            f.write("\n--- Average Keystrokes by Weekday and Hour ---\n")
+            f.write(heatmap.round(0).astype(int).to_string())
+            f.write("\n")
+            
+class MonitorDaemon:
+    """Background keyboard monitor controlled through a Unix socket
+
+    The daemon writes its PID to monitor.pid and listens on monitor.sock in
+    the log directory. Clients send one JSON object per line, e.g.
+    {"command": "stats"}, and get one JSON object back. Stats and reports
+    are answered from the running monitor's in-memory aggregates.
+    """
+
+    COMMANDS = ("start", "stop", "status", "flush", "stats", "report")
+
+    def __init__(self, log_dir="keyboard_logs", retention_minutes=60, compress="gzip"):
+        self.log_dir = log_dir
+        self.retention_minutes = retention_minutes
+        self.compress = compress
+        self.pid_file = os.path.join(log_dir, "monitor.pid")
+        self.socket_path = os.path.join(log_dir, "monitor.sock")
+        self.daemon_log = os.path.join(log_dir, "monitor.log")
+        self.monitor = None
+        self.running = False
+
+    @staticmethod
+    def supported():
+        return hasattr(os, "fork") and hasattr(socket, "AF_UNIX")
+
+    def send(self, command, timeout=10.0, **params):
+        """Send a command to the running daemon; returns None if none is running"""
+        if not self.supported() or not os.path.exists(self.socket_path):
+            return None
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+                client.settimeout(timeout)
+                client.connect(self.socket_path)
+                client.sendall(json.dumps({"command": command, **params}).encode() + b"\n")
+                with client.makefile('rb') as reader:
+                    line = reader.readline()
+            return json.loads(line) if line else None
+        except socket.timeout:
+            # The daemon is alive but busy (e.g. building a long report)
+            return {"ok": False, "error": f"the monitor did not answer within {timeout:g}s; it may be busy"}
+        except OSError:
+            self.remove_stale_files()
+            return None
+
+    def remove_stale_files(self):
+        """Clean up the PID file and socket left by a daemon that died"""
+        pid = self.read_pid()
+        if pid is not None and self.pid_alive(pid):
+            return
+        for path in (self.pid_file, self.socket_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def read_pid(self):
+        try:
+            with open(self.pid_file, 'r') as f:
+                return int(f.read().strip())
+        except (OSError, ValueError):
+            return None
+
+    @staticmethod
+    def pid_alive(pid):
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+        return True
+
+    def start(self):
+        """Fork into the background and wait until the control socket is up"""
+        if self.send("status") is not None:
+            print("Keyboard monitoring is already running.")
+            return False
+
+        os.makedirs(self.log_dir, exist_ok=True)
+        if os.fork() > 0:
+            # Parent: wait for the daemon to answer before reporting success
+            deadline = time.monotonic() + 10
+            while time.monotonic() < deadline:
+                status = self.send("status")
+                if status is not None:
+                    print(f"Keyboard monitoring started in background (PID {status['pid']}).")
+                    return True
+                time.sleep(0.1)
+            print(f"Daemon did not start; see {self.daemon_log}")
+            return False
+
+        # First child: detach from the terminal, then fork again so the
+        # daemon can never reacquire a controlling terminal
+        os.setsid()
+        if os.fork() > 0:
+            os._exit(0)
+
+        with open(os.devnull, 'rb') as devnull:
+            os.dup2(devnull.fileno(), sys.stdin.fileno())
+        with open(self.daemon_log, 'ab') as log:
+            os.dup2(log.fileno(), sys.stdout.fileno())
+            os.dup2(log.fileno(), sys.stderr.fileno())
+        try:
+            self.serve()
+        finally:
+            os._exit(0)
+
+    def run_foreground(self):
+        """Monitor in this process until Ctrl+C, for platforms without fork or Unix sockets"""
+        monitor = KeyboardMonitor(self.log_dir, self.retention_minutes, self.compress)
+        monitor.start_monitoring()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            monitor.stop_monitoring()
+
+    def serve(self):
+        """Run the monitor and answer control commands until told to stop"""
+        self.monitor = KeyboardMonitor(self.log_dir, self.retention_minutes, self.compress)
+        with open(self.pid_file, 'w') as f:
+            f.write(str(os.getpid()))
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.socket_path)
+        server.listen(5)
+        server.settimeout(1.0)
+
+        self.running = True
+        signal.signal(signal.SIGTERM, lambda signum, frame: setattr(self, "running", False))
+        self.monitor.start_monitoring()
+        try:
+            while self.running:
+                try:
+                    conn, _ = server.accept()
+                except socket.timeout:
+                    continue
+                with conn:
+                    self.handle(conn)
+        finally:
+            self.monitor.stop_monitoring()
+            server.close()
+            for path in (self.socket_path, self.pid_file):
+                if os.path.exists(path):
+                    os.remove(path)
+
+    def handle(self, conn):
+        conn.settimeout(5.0)
+        try:
+            with conn.makefile('rb') as reader:
+                request = json.loads(reader.readline() or b"{}")
+            response = self.dispatch(request.get("command"), request)
+        except Exception as e:
+            response = {"ok": False, "error": str(e)}
+        try:
+            conn.sendall(json.dumps(response).encode() + b"\n")
+        except OSError:
+            pass
+
+    def dispatch(self, command, request):
+        monitor = self.monitor
+        if command not in self.COMMANDS:
+            return {"ok": False, "error": f"Unknown command: {command}"}
+        if command == "start":
+            monitor.start_monitoring()
+        elif command == "stop":
+            self.running = False
+        elif command == "flush":
+            monitor.flush()
+        elif command == "stats":
+            return {"ok": True, "stats": monitor.get_stats()}
+        elif command == "report":
+            output_file = monitor.generate_report(request.get("output"), request.get("history_days", 30))
+            return {"ok": True, "output": os.path.abspath(output_file)}
+        return {
+            "ok": True,
+            "pid": os.getpid(),
+            "monitoring": monitor.is_running,
+            "today": monitor.today,
+            "total_keystrokes": monitor.data["total_count"],
+            "writer": monitor.get_writer_metrics()
+        }
+
+
+def format_minute(minute, count):
+    """'HH:MM (N keystrokes)' for a minute of the day, or N/A before any typing"""
+    return f"{minute // 60:02d}:{minute % 60:02d} ({count} keystrokes)" if count > 0 else "N/A"
+
+def print_stats(stats):
+    """Print a stats snapshot received from the daemon"""
+    peak_hour, peak_count = stats["peak_hour"]
+    peak_time = f"{peak_hour:02d}:00 - {peak_hour+1:02d}:00" if peak_count > 0 else "N/A"
+    print(f"Total Keystrokes: {stats['total_keystrokes']}")
+    print(f"Keystrokes Per Minute: {stats['keystrokes_per_minute']:.1f}")
+    print(f"Typing Speed (1/5/15 min): {stats['kpm_1min']:.0f} / {stats['kpm_5min']:.0f} / {stats['kpm_15min']:.0f} KPM")
+    print(f"Peak Hour: {peak_time} ({peak_count} keystrokes)")
+    print(f"Busiest Minute: {format_minute(*stats['peak_minute'])}")
+    print(f"Monitoring Duration: {stats['duration_hours']:.2f} hours")
+
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Keyboard Activity Monitor")
     parser.add_argument('--gui', action='store_true', help="Launch the graphical user interface")
     parser.add_argument('--start', action='store_true', help="Start monitoring in background")
     parser.add_argument('--stop', action='store_true', help="Stop monitoring")
+    parser.add_argument('--status', action='store_true', help="Show whether background monitoring is running")
+    parser.add_argument('--flush', action='store_true', help="Make the background monitor save to disk now")
+    parser.add_argument('--stats', action='store_true', help="Print live statistics from the background monitor")
     parser.add_argument('--report', action='store_true', help="Generate activity report")
     parser.add_argument('--output', help="Output file for report")
+    parser.add_argument('--history-days', type=int, default=30,
+                        help="Number of past days to summarize in the report (0 to skip)")
+    parser.add_argument('--compress', choices=["gzip", "zstd", "none"], default="gzip",
+                        help="Compression for closed daily logs (zstd needs the zstandard package)")
+    parser.add_argument('--retention-minutes', type=int, default=60,
+                        help="Minutes of keystroke timestamps to keep in memory (older ones stay on disk)")
     return parser.parse_args()
 
 if __name__ == "__main__":
     args = parse_arguments()
     
-    monitor = KeyboardMonitor()
+    compress = None if args.compress == "none" else args.compress
+    daemon = MonitorDaemon(retention_minutes=args.retention_minutes, compress=compress)
     
-    if args.gui:
-        # Launch GUI
-        monitor.run_gui()
-    elif args.start:
+    if args.start:
         # Start monitoring in background
-        monitor.start_monitoring()
-        print("Keyboard monitoring started in background.")
-        print("Use '--stop' to stop monitoring or '--gui' to view statistics.")
+        if daemon.supported():
+            if daemon.start():
+                print("Use '--stop' to stop monitoring or '--stats' to view statistics.")
+        else:
+            # No fork/Unix sockets (e.g. Windows): monitor in the foreground instead
+            print("Background mode is not supported on this platform; monitoring in the foreground (Ctrl+C to stop).")
+            daemon.run_foreground()
     elif args.stop:
         # Stop monitoring
-        monitor.stop_monitoring()
+        response = daemon.send("stop")
+        if response is None:
+            print("Keyboard monitoring is not running.")
+        elif not response.get("ok"):
+            print(f"Error: {response['error']}")
+        else:
+            print("Keyboard monitoring stopped.")
+    elif args.status or args.flush or args.stats:
+        command = "status" if args.status else "flush" if args.flush else "stats"
+        response = daemon.send(command)
+        if response is None:
+            print("Keyboard monitoring is not running.")
+        elif not response.get("ok"):
+            print(f"Error: {response['error']}")
+        elif command == "stats":
+            print_stats(response["stats"])
+        elif command == "flush":
+            print("Keystrokes flushed to disk.")
+        else:
+            print(f"Running (PID {response['pid']}), {response['total_keystrokes']} keystrokes today.")
+            print(f"Writer: {response['writer']}")
     elif args.report:
-        # Generate report
-        monitor.generate_report(args.output)
+        # Generate report, from the running daemon's data if there is one
+        response = daemon.send("report", timeout=300.0, output=args.output and os.path.abspath(args.output),
+                               history_days=args.history_days)
+        if response is not None and not response.get("ok"):
+            print(f"Error: {response['error']}")
+        elif response is not None:
+            print(f"Report generated: {response['output']}")
+        else:
+            monitor = KeyboardMonitor(retention_minutes=args.retention_minutes, compress=compress)
+            monitor.generate_report(args.output, args.history_days)
+    elif daemon.send("status") is not None:
+        # The GUI would compete with the daemon for today's journal
+        print("Keyboard monitoring is running in the background; use '--stats' or stop it with '--stop' first.")
     else:
-        # If no arguments, launch GUI by default
-        monitor.run_gui() 
\ No newline at end of file
+        # Launch GUI (the default when no arguments are given)
+        monitor = KeyboardMonitor(retention_minutes=args.retention_minutes, compress=compress)
+        monitor.run_gui()
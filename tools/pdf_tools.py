@@ -6,13 +6,23 @@ A set of tools for working with PDF files:
 - Merge multiple PDFs
 - Split a PDF into individual pages
 - Extract specific pages from a PDF
-- Extract text from a PDF
+- Extract text from a PDF (in parallel across CPU cores)
+- Run many of these operations from a batch manifest
 - Compress a PDF to reduce file size
 """
 
+import io
 import os
 import sys
+import math
+import json
+import time
 import argparse
+import contextlib
+import itertools
+from collections import deque, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 try:
     import PyPDF2
     from PyPDF2 import PdfReader, PdfWriter, PdfMerger
@@ -20,7 +30,91 @@ except ImportError:
     print("PyPDF2 is required. Please install it with 'pip install PyPDF2'")
     sys.exit(1)
 
+# Documents shorter than this are extracted in-process; starting workers costs more
+PARALLEL_MIN_PAGES = 16
+
+# Reader opened once by each worker process
+_worker_reader = None
+
+class ReaderCache:
+    """LRU cache of parsed PdfReaders, bounded by the bytes of input they hold
+
+    Readers are keyed by (absolute path, size, mtime), so a file that
+    changes on disk is parsed again and its stale reader dropped. A reader
+    keeps the whole file in memory, so each entry is charged its file size,
+    and the least recently used readers are evicted once the total exceeds
+    max_bytes. Files larger than the budget are parsed but not cached.
+    """
+    
+    def __init__(self, max_bytes=256 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.readers = OrderedDict()  # key -> (reader, size)
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        
+    def get(self, input_file):
+        st = os.stat(input_file)
+        path = os.path.abspath(input_file)
+        key = (path, st.st_size, st.st_mtime_ns)
+        
+        entry = self.readers.get(key)
+        if entry is not None:
+            self.readers.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+            
+        self.misses += 1
+        for stale in [k for k in self.readers if k[0] == path]:
+            self.evict(stale)
+            
+        reader = PdfReader(input_file)
+        if st.st_size <= self.max_bytes:
+            self.readers[key] = (reader, st.st_size)
+            self.total_bytes += st.st_size
+            while self.total_bytes > self.max_bytes:
+                self.evict(next(iter(self.readers)))
+        return reader
+        
+    def evict(self, key):
+        _, size = self.readers.pop(key)
+        self.total_bytes -= size
+        
+    def clear(self):
+        self.readers.clear()
+        self.total_bytes = 0
+
+def _open_worker_reader(input_file):
+    global _worker_reader
+    _worker_reader = PdfReader(input_file)
+
+def _extract_page_range(start, end):
+    """Text of pages start..end-1, run in a worker process"""
+    return [_worker_reader.pages[i].extract_text() for i in range(start, end)]
+
+def _write_page_range(start, end, output_file):
+    """Write pages start..end-1 to their own PDF, run in a worker process"""
+    PdfTools.write_pages(_worker_reader, start, end, output_file)
+
+def _set_reader_cache_budget(max_bytes):
+    PdfTools.reader_cache.max_bytes = max_bytes
+
+def _run_job_group(group):
+    """Run a group of (index, job) pairs in order, in a batch worker"""
+    return [(index,) + PdfTools.run_batch_job(job) for index, job in group]
+
 class PdfTools:
+    # Operations a batch manifest may use
+    BATCH_OPERATIONS = ("merge", "split", "extract", "text")
+    
+    # Parsed readers shared by every operation in this process
+    reader_cache = ReaderCache()
+    
+    @staticmethod
+    def open_reader(input_file):
+        """A PdfReader for input_file, reused while the file is unchanged"""
+        return PdfTools.reader_cache.get(input_file)
+    
     @staticmethod
     def merge_pdfs(input_files, output_file):
         """Merge multiple PDF files into one"""
@@ -48,8 +142,21 @@ class PdfTools:
             return False
     
     @staticmethod
-    def split_pdf(input_file, output_dir=None):
-        """Split a PDF into individual pages"""
+    def write_pages(reader, start, end, output_file):
+        """Write pages start..end-1 of reader to output_file"""
+        writer = PdfWriter()
+        for i in range(start, end):
+            writer.add_page(reader.pages[i])
+        with open(output_file, "wb") as f:
+            writer.write(f)
+    
+    @staticmethod
+    def split_pdf(input_file, output_dir=None, jobs=1, chunk_size=1):
+        """Split a PDF into individual pages, or into files of chunk_size pages
+
+        With jobs > 1 the files are written by a pool of worker processes
+        that each parse the input once.
+        """
         if not os.path.exists(input_file):
             print(f"Error: File not found: {input_file}")
             return False
@@ -62,21 +169,36 @@ class PdfTools:
         os.makedirs(output_dir, exist_ok=True)
         
         try:
-            reader = PdfReader(input_file)
+            reader = PdfTools.open_reader(input_file)
             total_pages = len(reader.pages)
+            chunk_size = max(1, chunk_size)
+            jobs = jobs or os.cpu_count() or 1
             
             base_name = os.path.splitext(os.path.basename(input_file))[0]
             
-            # Extract each page
-            for i, page in enumerate(reader.pages):
-                writer = PdfWriter()
-                writer.add_page(page)
-                
-                output_file = os.path.join(output_dir, f"{base_name}_page_{i+1}.pdf")
-                with open(output_file, "wb") as f:
-                    writer.write(f)
+            # Page range and output file of each chunk
+            starts = list(range(0, total_pages, chunk_size))
+            ends = [min(start + chunk_size, total_pages) for start in starts]
+            if chunk_size == 1:
+                names = [f"{base_name}_page_{start+1}.pdf" for start in starts]
+            else:
+                names = [f"{base_name}_pages_{start+1}-{end}.pdf" for start, end in zip(starts, ends)]
+            output_files = [os.path.join(output_dir, name) for name in names]
+            
+            if jobs == 1 or len(starts) == 1:
+                for start, end, output_file in zip(starts, ends, output_files):
+                    PdfTools.write_pages(reader, start, end, output_file)
+            else:
+                with ProcessPoolExecutor(max_workers=jobs, initializer=_open_worker_reader,
+                                         initargs=(input_file,)) as pool:
+                    # Hand out chunks in batches to keep per-task overhead low
+                    batch = max(1, len(starts) // (jobs * 4))
+                    list(pool.map(_write_page_range, starts, ends, output_files, chunksize=batch))
                     
-            print(f"Split {input_file} into {total_pages} individual pages in {output_dir}")
+            if chunk_size == 1:
+                print(f"Split {input_file} into {total_pages} individual pages in {output_dir}")
+            else:
+                print(f"Split {input_file} into {len(starts)} files of up to {chunk_size} pages in {output_dir}")
             return True
         except Exception as e:
             print(f"Error splitting PDF: {e}")
@@ -90,7 +212,7 @@ class PdfTools:
             return False
             
         try:
-            reader = PdfReader(input_file)
+            reader = PdfTools.open_reader(input_file)
             writer = PdfWriter()
             
             # Parse page numbers
@@ -125,36 +247,289 @@ class PdfTools:
             return False
     
     @staticmethod
-    def extract_text(input_file, output_file=None):
-        """Extract text from a PDF"""
+    def page_ranges(total_pages, jobs):
+        """Split pages into ranges small enough to keep every worker busy
+
+        The first ranges are a single page and double in size from there,
+        so the first pages come back quickly even on a large document.
+        """
+        target = max(1, min(64, math.ceil(total_pages / (jobs * 4))))
+        ranges = []
+        start, size = 0, 1
+        while start < total_pages:
+            ranges.append((start, min(start + size, total_pages)))
+            start += size
+            size = min(size * 2, target)
+        return ranges
+    
+    @staticmethod
+    def iter_page_text(input_file, jobs=None):
+        """Yield (page number, text) in page order, extracting with a process pool
+
+        Pages are yielded as soon as they and every page before them are
+        extracted, and only a few page ranges are held at a time, so memory
+        stays bounded however long the document is.
+        """
+        reader = PdfTools.open_reader(input_file)
+        total_pages = len(reader.pages)
+        jobs = jobs or os.cpu_count() or 1
+        
+        if jobs == 1 or total_pages < PARALLEL_MIN_PAGES:
+            for i, page in enumerate(reader.pages):
+                yield i + 1, page.extract_text()
+            return
+            
+        # Each worker opens the file itself and extracts whole page ranges
+        ranges = iter(PdfTools.page_ranges(total_pages, jobs))
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_open_worker_reader,
+                                 initargs=(input_file,)) as pool:
+            # Only a few ranges per worker are in flight, so finished text
+            # waiting for an earlier, slower range can't pile up
+            pending = deque(
+                (start, pool.submit(_extract_page_range, start, end))
+                for start, end in itertools.islice(ranges, jobs * 2))
+            try:
+                while pending:
+                    start, future = pending.popleft()
+                    texts = future.result()
+                    next_range = next(ranges, None)
+                    if next_range:
+                        pending.append((next_range[0], pool.submit(_extract_page_range, *next_range)))
+                    for offset, text in enumerate(texts):
+                        yield start + offset + 1, text
+            finally:
+                # A consumer that stops early shouldn't wait for unneeded ranges
+                for _, future in pending:
+                    future.cancel()
+    
+    @staticmethod
+    def extract_text(input_file, output_file=None, jobs=None, output_format="text"):
+        """Extract text from a PDF, writing each page as soon as it is ready
+
+        output_format "jsonl" writes one JSON record per page with its page
+        number, text, character count and whether it was empty.
+        """
+        # Diagnostics go to stderr so they never mix with the extracted text
         if not os.path.exists(input_file):
-            print(f"Error: File not found: {input_file}")
+            print(f"Error: File not found: {input_file}", file=sys.stderr)
             return False
             
         try:
-            reader = PdfReader(input_file)
-            text = ""
-            
-            for i, page in enumerate(reader.pages):
-                text += f"--- Page {i+1} ---\n"
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n\n"
-                else:
-                    text += "[No extractable text on this page]\n\n"
-                    
             # Write to file or print to stdout
+            out = open(output_file, "w", encoding="utf-8") if output_file else sys.stdout
+            pages = PdfTools.iter_page_text(input_file, jobs)
+            try:
+                for page_number, page_text in pages:
+                    page_text = page_text or ""
+                    if output_format == "jsonl":
+                        out.write(json.dumps({
+                            "page": page_number,
+                            "text": page_text,
+                            "chars": len(page_text),
+                            "empty": not page_text.strip()
+                        }) + "\n")
+                        out.flush()
+                    elif page_text:
+                        out.write(f"--- Page {page_number} ---\n{page_text}\n\n")
+                    else:
+                        out.write(f"--- Page {page_number} ---\n[No extractable text on this page]\n\n")
+            finally:
+                # Stops the worker pool now if the output went away early
+                pages.close()
+                if output_file:
+                    out.close()
+                    
             if output_file:
-                with open(output_file, "w", encoding="utf-8") as f:
-                    f.write(text)
                 print(f"Extracted text from {input_file} to {output_file}")
-            else:
-                print(text)
+            elif output_format == "text":
+                print()
                 
             return True
+        except BrokenPipeError:
+            # The reader stopped early (e.g. `| head`); that isn't an error.
+            # Point stdout at devnull so the flush at exit doesn't fail again
+            if not output_file:
+                os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+            return True
+        except Exception as e:
+            print(f"Error extracting text: {e}", file=sys.stderr)
+            return False
+
+    @staticmethod
+    def load_manifest(manifest_file):
+        """Jobs from a JSONL manifest (one job per line) or a YAML list of jobs"""
+        if manifest_file.endswith((".yaml", ".yml")):
+            try:
+                import yaml
+            except ImportError:
+                raise RuntimeError("PyYAML is required for YAML manifests. Please install it with 'pip install pyyaml'")
+            with open(manifest_file, "r", encoding="utf-8") as f:
+                data = yaml.safe_load(f) or []
+            return data.get("jobs", []) if isinstance(data, dict) else data
+            
+        with open(manifest_file, "r", encoding="utf-8") as f:
+            return [json.loads(line) for line in f if line.strip() and not line.lstrip().startswith("#")]
+    
+    @staticmethod
+    def run_batch_job(job):
+        """Run one manifest job; returns (success, seconds, messages)"""
+        buffer = io.StringIO()
+        start = time.perf_counter()
+        try:
+            op = job.get("op")
+            # Messages the tools print become part of the job's report
+            with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+                if op == "merge":
+                    success = PdfTools.merge_pdfs(job["inputs"], job["output"])
+                elif op == "split":
+                    success = PdfTools.split_pdf(job["input"], job.get("output_dir"), 1, job.get("chunk_size", 1))
+                elif op == "extract":
+                    success = PdfTools.extract_pages(job["input"], str(job["pages"]), job["output"])
+                elif op == "text":
+                    success = PdfTools.extract_text(job["input"], job["output"], 1, job.get("format", "text"))
+                else:
+                    print(f"Error: Unknown operation '{op}', expected one of {', '.join(PdfTools.BATCH_OPERATIONS)}")
+                    success = False
+        except KeyError as e:
+            buffer.write(f"Error: Job is missing the {e} field")
+            success = False
+        except Exception as e:
+            buffer.write(f"Error: {e}")
+            success = False
+        return bool(success), time.perf_counter() - start, buffer.getvalue().strip()
+    
+    @staticmethod
+    def group_jobs(jobs):
+        """Group job indexes so that jobs sharing an input or output file stay together
+
+        Each group runs in order in one worker, so a job can use the output
+        of an earlier job (including the page files a split writes) and jobs
+        on the same input reuse its parsed reader.
+        """
+        parent = list(range(len(jobs)))
+        
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+            
+        def union(i, path):
+            if path in owner:
+                parent[find(i)] = find(owner[path])
+            else:
+                owner[path] = i
+                
+        # Split jobs write <output_dir>/<input name>_page(s)_*.pdf
+        split_pages = {}
+        for i, job in enumerate(jobs):
+            if isinstance(job, dict) and job.get("op") == "split" and job.get("input"):
+                output_dir = os.path.abspath(job.get("output_dir") or os.path.dirname(job["input"]) or ".")
+                prefix = os.path.splitext(os.path.basename(job["input"]))[0] + "_page"
+                split_pages.setdefault(output_dir, []).append((prefix, i))
+                
+        owner = {}
+        for i, job in enumerate(jobs):
+            files = list(job.get("inputs", [])) if isinstance(job, dict) else []
+            for key in ("input", "output"):
+                if isinstance(job, dict) and job.get(key):
+                    files.append(job[key])
+            for path in files:
+                path = os.path.abspath(path)
+                union(i, path)
+                # Reading pages that a split job writes depends on that job
+                directory, name = os.path.split(path)
+                for prefix, j in split_pages.get(directory, ()):
+                    if name.startswith(prefix):
+                        union(i, f"split:{j}")
+                        
+        # Splits writing the same page files must not run at the same time
+        for directory, prefixes in split_pages.items():
+            for prefix, j in prefixes:
+                union(j, f"split:{j}")
+                union(j, os.path.join(directory, prefix + "*"))
+                    
+        groups = {}
+        for i in range(len(jobs)):
+            groups.setdefault(find(i), []).append(i)
+        return list(groups.values())
+    
+    @staticmethod
+    def run_batch(manifest_file, jobs=None, report_file=None, cache_mb=None):
+        """Run every job in a manifest with a worker pool and print a summary"""
+        try:
+            manifest = PdfTools.load_manifest(manifest_file)
         except Exception as e:
-            print(f"Error extracting text: {e}")
+            print(f"Error reading manifest: {e}")
+            return False
+        if not manifest:
+            print(f"Error: No jobs in {manifest_file}")
             return False
+            
+        workers = jobs or os.cpu_count() or 1
+        groups = [[(i, manifest[i]) for i in group] for group in PdfTools.group_jobs(manifest)]
+        # Largest groups first so one long chain doesn't start last
+        groups.sort(key=len, reverse=True)
+        
+        if cache_mb is not None:
+            PdfTools.reader_cache.max_bytes = cache_mb * 1024 * 1024
+            
+        results = {}
+        start = time.perf_counter()
+        if workers == 1 or len(groups) == 1:
+            for group in groups:
+                for index, success, seconds, messages in _run_job_group(group):
+                    results[index] = (success, seconds, messages)
+        else:
+            def run_pool(pending, size):
+                """Run groups in a fresh pool; returns those a broken pool didn't finish"""
+                unfinished = []
+                with ProcessPoolExecutor(max_workers=size, initializer=_set_reader_cache_budget,
+                                         initargs=(PdfTools.reader_cache.max_bytes,)) as pool:
+                    futures = {pool.submit(_run_job_group, group): group for group in pending}
+                    for future, group in futures.items():
+                        try:
+                            for index, success, seconds, messages in future.result():
+                                results[index] = (success, seconds, messages)
+                        except BrokenProcessPool:
+                            unfinished.append(group)
+                        except Exception as e:
+                            for index, _ in group:
+                                results[index] = (False, 0.0, f"Error: Worker failed: {e}")
+                return unfinished
+                
+            unfinished = run_pool(groups, min(workers, len(groups)))
+            # A worker that dies (killed, out of memory) breaks the whole pool and
+            # every group it hadn't finished, so those get one more full pool
+            if unfinished:
+                unfinished = run_pool(unfinished, min(workers, len(unfinished)))
+            # Broken again: a group keeps killing its worker. Give each remaining
+            # group a worker of its own so only that group fails
+            for group in unfinished:
+                if run_pool([group], 1):
+                    for index, _ in group:
+                        results[index] = (False, 0.0, "Error: Worker crashed (killed or out of memory)")
+        elapsed = time.perf_counter() - start
+        
+        report = []
+        for i, job in enumerate(manifest):
+            success, seconds, messages = results[i]
+            op = job.get("op", "?") if isinstance(job, dict) else "?"
+            print(f"[{'OK' if success else 'FAILED'}] #{i+1} {op} ({seconds:.2f}s)")
+            if messages and not success:
+                print(f"    {messages.splitlines()[-1]}")
+            report.append({"job": i + 1, "op": op, "success": success, "seconds": round(seconds, 3), "messages": messages})
+            
+        failed = sum(1 for entry in report if not entry["success"])
+        job_time = sum(entry["seconds"] for entry in report)
+        print(f"\n{len(report) - failed}/{len(report)} jobs succeeded in {elapsed:.2f}s "
+              f"({job_time:.2f}s of job time, {workers} worker{'s' if workers != 1 else ''})")
+              
+        if report_file:
+            with open(report_file, "w", encoding="utf-8") as f:
+                json.dump({"manifest": manifest_file, "seconds": round(elapsed, 3), "failed": failed, "jobs": report}, f, indent=2)
+            print(f"Report written to {report_file}")
+        return failed == 0
 
 def parse_arguments():
     """Parse command line arguments"""
@@ -170,6 +545,9 @@ def parse_arguments():
     split_parser = subparsers.add_parser("split", help="Split a PDF into individual pages")
     split_parser.add_argument("input_file", help="Input PDF file to split")
     split_parser.add_argument("-o", "--output-dir", help="Output directory for the pages")
+    split_parser.add_argument("-j", "--jobs", type=int, default=1,
+                              help="Worker processes writing files in parallel (0 = one per CPU core)")
+    split_parser.add_argument("-k", "--chunk-size", type=int, default=1, help="Pages per output file")
     
     # Extract pages command
     extract_parser = subparsers.add_parser("extract", help="Extract specific pages from a PDF")
@@ -181,6 +559,17 @@ def parse_arguments():
     text_parser = subparsers.add_parser("text", help="Extract text from a PDF")
     text_parser.add_argument("input_file", help="Input PDF file")
     text_parser.add_argument("-o", "--output", help="Output text file (if not specified, prints to stdout)")
+    text_parser.add_argument("-j", "--jobs", type=int, help="Worker processes (default: one per CPU core)")
+    text_parser.add_argument("--format", choices=["text", "jsonl"], default="text",
+                             help="Output format: plain text, or one JSON record per page")
+    
+    # Batch command
+    batch_parser = subparsers.add_parser("batch", help="Run the jobs in a manifest file (JSONL or YAML)")
+    batch_parser.add_argument("manifest", help="Manifest file; each job has an 'op' and that operation's fields")
+    batch_parser.add_argument("-j", "--jobs", type=int, help="Worker processes (default: one per CPU core)")
+    batch_parser.add_argument("--report", help="Write a JSON report of the results to this file")
+    batch_parser.add_argument("--cache-mb", type=int,
+                              help="Memory budget per worker for parsed PDFs reused across jobs (default: 256)")
     
     return parser.parse_args()
 
@@ -191,14 +580,16 @@ def main():
     if args.command == "merge":
         return PdfTools.merge_pdfs(args.input_files, args.output)
     elif args.command == "split":
-        return PdfTools.split_pdf(args.input_file, args.output_dir)
+        return PdfTools.split_pdf(args.input_file, args.output_dir, args.jobs, args.chunk_size)
     elif args.command == "extract":
         return PdfTools.extract_pages(args.input_file, args.pages, args.output)
     elif args.command == "text":
-        return PdfTools.extract_text(args.input_file, args.output)
+        return PdfTools.extract_text(args.input_file, args.output, args.jobs, args.format)
+    elif args.command == "batch":
+        return PdfTools.run_batch(args.manifest, args.jobs, args.report, args.cache_mb)
     else:
         print("Error: No command specified")
-        print("Available commands: merge, split, extract, text")
+        print("Available commands: merge, split, extract, text, batch")
         return False
         
 if __name__ == "__main__":
@@ -1,13 +1,30 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
 import time
 import json
 import os
 import datetime
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from threading import Thread
+import math
 import csv
+import argparse
+
+# Tk and matplotlib are imported on first use, so the CLI mode and the
+# timer window don't pay for charting until the weekly report is opened
+tk = None
+ttk = None
+messagebox = None
+Figure = None
+FigureCanvasTkAgg = None
+
+def load_tk():
+    global tk, ttk, messagebox
+    if tk is None:
+        import tkinter as tk
+        from tkinter import ttk, messagebox
+
+def load_plotting():
+    global Figure, FigureCanvasTkAgg
+    if Figure is None:
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
 # Try to import the notification library, with graceful fallback
 try:
@@ -26,32 +43,372 @@ else:
             timeout=10
         )
 
+def notify_cli(title, message):
+    """Notify from the terminal: desktop notification if plyer works, else a bell"""
+    try:
+        notification.notify(title=title, message=message, app_name="Pomodoro Timer", timeout=10)
+    except Exception:
+        print(f"\a{message}")
+
+class SessionLog:
+    """Append-only CSV of focus sessions with a per-day totals index
+
+    Completed sessions are appended to the CSV. A small JSON sidecar keeps
+    the focus minutes per day plus the CSV byte offset it has indexed up to,
+    so startup and reports read O(days) of index instead of every session.
+    Rows added to the CSV by other means are picked up from that offset.
+    """
+    
+    FIELDS = ['date', 'start_time', 'duration_minutes']
+    
+    def __init__(self, data_file="pomodoro_data.csv", index_file=None):
+        self.data_file = data_file
+        self.index_file = index_file or os.path.splitext(data_file)[0] + "_index.json"
+        self.daily_totals = {}  # 'YYYY-MM-DD' -> focus minutes
+        self.offset = 0
+        self.version = 0  # bumped whenever totals change, for cache invalidation
+        self.load()
+        
+    def load(self):
+        # Create the data file if it doesn't exist
+        if not os.path.exists(self.data_file):
+            with open(self.data_file, 'w', newline='') as file:
+                writer = csv.writer(file)
+                writer.writerow(self.FIELDS)
+                
+        try:
+            with open(self.index_file, 'r') as f:
+                index = json.load(f)
+            self.daily_totals = index["daily_totals"]
+            self.offset = index["offset"]
+        except (OSError, ValueError, KeyError):
+            self.daily_totals, self.offset = {}, 0
+            
+        # Rebuild from scratch if the CSV was replaced by a shorter file
+        if os.path.getsize(self.data_file) < self.offset:
+            self.daily_totals, self.offset = {}, 0
+        if self.catch_up():
+            self.save_index()
+            
+    def catch_up(self):
+        """Index rows appended to the CSV after the stored offset"""
+        with open(self.data_file, 'rb') as f:
+            f.seek(self.offset)
+            tail = f.read()
+        # Only index complete lines
+        tail = tail[:tail.rfind(b"\n") + 1]
+        if not tail:
+            return False
+            
+        rows = csv.reader(tail.decode('utf-8').splitlines())
+        for row in rows:
+            if len(row) < 3 or row == self.FIELDS:
+                continue
+            try:
+                self.add_to_totals(row[0], int(row[2]))
+            except ValueError:
+                continue
+        self.offset += len(tail)
+        return True
+        
+    def add_to_totals(self, date, minutes):
+        self.daily_totals[date] = self.daily_totals.get(date, 0) + minutes
+        self.version += 1
+        
+    def append(self, session):
+        """Append one session and update the index"""
+        with open(self.data_file, 'a', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=self.FIELDS)
+            writer.writerow(session)
+        self.add_to_totals(session['date'], int(session['duration_minutes']))
+        self.offset = os.path.getsize(self.data_file)
+        self.save_index()
+        
+    def save_index(self):
+        # Write to a temp file first so an interrupted save keeps the old index
+        tmp_file = self.index_file + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump({"offset": self.offset, "daily_totals": self.daily_totals}, f)
+        os.replace(tmp_file, self.index_file)
+        
+    def total_for(self, date):
+        return self.daily_totals.get(date, 0)
+        
+    def totals_for(self, dates):
+        return {date: self.daily_totals.get(date, 0) for date in dates}
+
+def format_countdown(seconds, show_tenths=False):
+    """MM:SS, rounded up so the display reaches 00:00 exactly at the deadline"""
+    if show_tenths and 0 < seconds < 10:
+        tenths = math.ceil(seconds * 10)
+        return f"00:{tenths // 10:02d}.{tenths % 10}"
+    seconds = math.ceil(seconds)
+    minutes = seconds // 60
+    seconds = seconds % 60
+    return f"{minutes:02d}:{seconds:02d}"
+
+class PomodoroEngine:
+    """Pomodoro state machine with no GUI dependency
+
+    Time comes from an injectable monotonic `clock` (and `wall_clock` for
+    session start times), so tests and benchmarks can drive thousands of
+    cycles instantly. Callers call poll() whenever they like; it derives the
+    remaining time from the deadline and fires events:
+
+        tick(remaining)            on every poll while running
+        period_complete(mode)      when a period runs out
+        mode_change(mode, seconds) after switching to the next period
+        session_recorded(session)  when a work period is logged
+        state_change(running)      on start/pause/reset
+    """
+    
+    EVENTS = ("tick", "period_complete", "mode_change", "session_recorded", "state_change")
+    
+    def __init__(self, work_minutes=25, short_break_minutes=5, long_break_minutes=15, max_pomodoros=4,
+                 clock=time.monotonic, wall_clock=time.time, session_log=None, auto_continue=False):
+        self.work_minutes = work_minutes
+        self.short_break_minutes = short_break_minutes
+        self.long_break_minutes = long_break_minutes
+        self.max_pomodoros = max_pomodoros
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.session_log = session_log
+        # Start the next period immediately, chained off the previous deadline
+        self.auto_continue = auto_continue
+        self.callbacks = {event: [] for event in self.EVENTS}
+        
+        self.mode = "Work"
+        self.pomodoro_count = 0
+        self.running = False
+        self.time_left = self.work_minutes * 60  # seconds, as of the last poll/pause
+        self.deadline = None
+        
+        # Wall-clock start and active (unpaused) seconds of the current work period
+        self.work_started_at = None
+        self.work_active_seconds = 0.0
+        self.segment_started = None
+        
+    def on(self, event, callback):
+        """Register a callback for one of EVENTS"""
+        self.callbacks[event].append(callback)
+        
+    def emit(self, event, *args):
+        for callback in self.callbacks[event]:
+            callback(*args)
+            
+    def period_seconds(self, mode):
+        minutes = {
+            "Work": self.work_minutes,
+            "Short Break": self.short_break_minutes,
+            "Long Break": self.long_break_minutes
+        }[mode]
+        return minutes * 60
+        
+    def start(self, now=None):
+        """Start or resume the current period"""
+        if self.running:
+            return
+        now = self.clock() if now is None else now
+        self.running = True
+        # Resuming keeps the remaining time; the deadline is rebased on it
+        self.segment_started = now
+        self.deadline = now + self.time_left
+        if self.mode == "Work" and self.work_started_at is None:
+            self.work_started_at = self.wall_clock() - (self.clock() - now)
+            self.work_active_seconds = 0.0
+        self.emit("state_change", True)
+        
+    def pause(self):
+        if not self.running:
+            return
+        now = self.clock()
+        self.time_left = max(0.0, self.deadline - now)
+        self.end_segment(now)
+        self.running = False
+        self.emit("state_change", False)
+        
+    def reset(self):
+        if self.running:
+            self.end_segment(self.clock())
+        self.running = False
+        self.mode = "Work"
+        self.pomodoro_count = 0
+        self.time_left = self.period_seconds("Work")
+        self.work_started_at = None
+        self.emit("state_change", False)
+        self.emit("mode_change", self.mode, self.time_left)
+        
+    def update_durations(self, work_minutes, short_break_minutes, long_break_minutes):
+        self.work_minutes = work_minutes
+        self.short_break_minutes = short_break_minutes
+        self.long_break_minutes = long_break_minutes
+        # Only an untouched work period picks up the new length right away
+        if not self.running and self.mode == "Work" and self.work_started_at is None:
+            self.time_left = self.period_seconds("Work")
+            
+    def end_segment(self, now):
+        """Bank the active time of the running segment"""
+        if self.mode == "Work" and self.segment_started is not None:
+            self.work_active_seconds += now - self.segment_started
+        self.segment_started = None
+        
+    def poll(self):
+        """Update time_left from the clock and handle any finished periods"""
+        if not self.running:
+            return self.time_left
+        now = self.clock()
+        # Loop so an auto-continuing engine catches up on several periods at once
+        while self.running and now >= self.deadline:
+            self.complete_period(self.deadline)
+        if self.running:
+            self.time_left = self.deadline - now
+            self.emit("tick", self.time_left)
+        return self.time_left
+        
+    def complete_period(self, finished_at):
+        """Record the finished period and switch to the next one"""
+        self.time_left = 0
+        self.end_segment(finished_at)
+        self.running = False
+        finished_mode = self.mode
+        
+        # Record focus session if it was work time
+        if finished_mode == "Work" and self.work_started_at is not None:
+            session = {
+                'date': datetime.datetime.fromtimestamp(self.wall_clock()).strftime('%Y-%m-%d'),
+                'start_time': datetime.datetime.fromtimestamp(self.work_started_at).strftime('%H:%M'),
+                'duration_minutes': int(self.work_active_seconds / 60)
+            }
+            if self.session_log:
+                self.session_log.append(session)
+            self.emit("session_recorded", session)
+        self.work_started_at = None
+        
+        self.emit("period_complete", finished_mode)
+        self.switch_mode()
+        
+        if self.auto_continue:
+            self.start(now=finished_at)
+            
+    def switch_mode(self):
+        if self.mode == "Work":
+            self.pomodoro_count += 1
+            if self.pomodoro_count % self.max_pomodoros == 0:
+                self.mode = "Long Break"
+            else:
+                self.mode = "Short Break"
+        else:
+            self.mode = "Work"
+        self.time_left = self.period_seconds(self.mode)
+        self.emit("mode_change", self.mode, self.time_left)
+        
+    def next_change_delay(self, step=1.0):
+        """Seconds until the displayed countdown (in units of step) next changes"""
+        remaining = self.time_left
+        return remaining % step or step
+
+class FocusReport:
+    """Focus-time aggregates for the report window, cached per range
+
+    Results are computed from the session log's per-day index and reused
+    until the log's version changes (i.e. a session is appended) or the
+    date rolls over.
+    """
+    
+    RANGES = ("Week", "Month", "Year")
+    
+    def __init__(self, session_log):
+        self.session_log = session_log
+        self.cache = {}  # range name -> (version, today, aggregate)
+        
+    def aggregate(self, range_name, today=None):
+        """Bar labels, values and summary numbers for one range"""
+        today = today or datetime.date.today()
+        cached = self.cache.get(range_name)
+        if cached and cached[0] == self.session_log.version and cached[1] == today:
+            return cached[2]
+        
+        if range_name == "Year":
+            result = self.monthly(today)
+        else:
+            result = self.daily(today, 7 if range_name == "Week" else 30)
+        self.cache[range_name] = (self.session_log.version, today, result)
+        return result
+        
+    def daily(self, today, days):
+        dates = [today - datetime.timedelta(days=i) for i in range(days - 1, -1, -1)]
+        totals = self.session_log.totals_for([d.isoformat() for d in dates])
+        label_format = '%a' if days <= 7 else '%d'
+        return self.summarize(
+            f"Daily Focus Time (Last {days} Days)",
+            [d.strftime(label_format) for d in dates],
+            list(totals.values()),
+            days
+        )
+        
+    def monthly(self, today):
+        # The last 12 calendar months, including the current one
+        months = []
+        year, month = today.year, today.month
+        for _ in range(12):
+            months.append((year, month))
+            year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+        months.reverse()
+        
+        # Daily totals are keyed 'YYYY-MM-DD', so a 'YYYY-MM' prefix selects a month
+        monthly_totals = {f"{y:04d}-{m:02d}": 0 for y, m in months}
+        for date, minutes in self.session_log.daily_totals.items():
+            key = date[:7]
+            if key in monthly_totals:
+                monthly_totals[key] += minutes
+                
+        first_day = datetime.date(months[0][0], months[0][1], 1)
+        return self.summarize(
+            "Monthly Focus Time (Last 12 Months)",
+            [datetime.date(y, m, 1).strftime('%b') for y, m in months],
+            list(monthly_totals.values()),
+            (today - first_day).days + 1
+        )
+        
+    @staticmethod
+    def summarize(title, labels, values, days):
+        total = sum(values)
+        return {
+            "title": title,
+            "labels": labels,
+            "values": values,
+            "total": total,
+            "daily_average": total / days
+        }
+
 class PomodoroTimer:
     def __init__(self, root):
+        load_tk()
         self.root = root
         self.root.title("Pomodoro Timer")
         self.root.geometry("600x500")
         self.root.resizable(False, False)
         
-        # Default settings
-        self.work_minutes = 25
-        self.short_break_minutes = 5
-        self.long_break_minutes = 15
-        self.pomodoro_count = 0
-        self.max_pomodoros = 4
-        
-        # Timer state
-        self.running = False
-        self.time_left = self.work_minutes * 60
-        self.mode = "Work"
-        self.timer_thread = None
-        
         # Focus tracking data
         self.today_focus_minutes = 0
-        self.focus_sessions = []
         self.data_file = "pomodoro_data.csv"
         self.load_data()
         
+        # Timer state lives in the engine; this class only renders it.
+        # The engine's deadline is polled from Tk's after loop, so callback
+        # jitter never accumulates as drift
+        self.engine = PomodoroEngine(session_log=self.session_log)
+        self.engine.on("session_recorded", self.on_session_recorded)
+        self.engine.on("period_complete", self.on_period_complete)
+        self.engine.on("mode_change", self.on_mode_change)
+        
+        # Report window and figure are built once and reused
+        self.report = FocusReport(self.session_log)
+        self.report_window = None
+        self.tick_job = None
+        self.show_tenths = False  # show tenths of a second in the last 10 seconds
+        self.displayed_text = None
+        
         # UI elements
         self.setup_ui()
         
@@ -96,19 +453,25 @@ class PomodoroTimer:
         ttk.Label(settings_frame, text="Work Duration (min):").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
         self.work_spinbox = ttk.Spinbox(settings_frame, from_=1, to=60, width=5, command=self.update_settings)
         self.work_spinbox.grid(row=0, column=1, padx=5, pady=5)
-        self.work_spinbox.set(self.work_minutes)
+        self.work_spinbox.set(self.engine.work_minutes)
         
         # Short break duration setting
         ttk.Label(settings_frame, text="Short Break (min):").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
         self.short_break_spinbox = ttk.Spinbox(settings_frame, from_=1, to=30, width=5, command=self.update_settings)
         self.short_break_spinbox.grid(row=1, column=1, padx=5, pady=5)
-        self.short_break_spinbox.set(self.short_break_minutes)
+        self.short_break_spinbox.set(self.engine.short_break_minutes)
         
         # Long break duration setting
         ttk.Label(settings_frame, text="Long Break (min):").grid(row=2, column=0, padx=5, pady=5, sticky=tk.W)
         self.long_break_spinbox = ttk.Spinbox(settings_frame, from_=1, to=60, width=5, command=self.update_settings)
         self.long_break_spinbox.grid(row=2, column=1, padx=5, pady=5)
-        self.long_break_spinbox.set(self.long_break_minutes)
+        self.long_break_spinbox.set(self.engine.long_break_minutes)
+        
+        # Sub-second display toggle
+        self.tenths_var = tk.BooleanVar(value=self.show_tenths)
+        ttk.Checkbutton(settings_frame, text="Show tenths in the last 10 seconds", variable=self.tenths_var,
+                        command=lambda: setattr(self, "show_tenths", self.tenths_var.get())).grid(
+            row=3, column=0, columnspan=2, padx=5, pady=5, sticky=tk.W)
         
         # Focus statistics frame
         stats_frame = ttk.LabelFrame(main_frame, text="Focus Statistics")
@@ -119,205 +482,218 @@ class PomodoroTimer:
         self.today_stats_label.pack(pady=5)
         
         # Visualization button
-        self.viz_btn = ttk.Button(stats_frame, text="Show Weekly Report", command=self.show_visualization)
+        self.viz_btn = ttk.Button(stats_frame, text="Show Focus Report", command=self.show_visualization)
         self.viz_btn.pack(pady=5)
     
     def update_settings(self):
         # Update timer settings from spinboxes
         try:
-            self.work_minutes = int(self.work_spinbox.get())
-            self.short_break_minutes = int(self.short_break_spinbox.get())
-            self.long_break_minutes = int(self.long_break_spinbox.get())
-            
-            # Update display if timer is not running
-            if not self.running:
-                self.time_left = self.work_minutes * 60
-                self.update_timer_display()
+            self.engine.update_durations(
+                int(self.work_spinbox.get()),
+                int(self.short_break_spinbox.get()),
+                int(self.long_break_spinbox.get())
+            )
+            self.update_timer_display()
         except ValueError:
             messagebox.showerror("Invalid Input", "Please enter valid numbers for timer durations.")
     
     def format_time(self, seconds):
-        minutes = seconds // 60
-        seconds = seconds % 60
-        return f"{minutes:02d}:{seconds:02d}"
+        return format_countdown(seconds, self.show_tenths)
     
     def update_timer_display(self):
-        self.timer_display.config(text=self.format_time(self.time_left))
+        # Skip the Tk call when the visible text has not changed
+        text = self.format_time(self.engine.time_left)
+        if text != self.displayed_text:
+            self.displayed_text = text
+            self.timer_display.config(text=text)
         
     def start_timer(self):
-        if not self.running:
-            self.running = True
+        if not self.engine.running:
             self.start_btn.config(state=tk.DISABLED)
             self.pause_btn.config(state=tk.NORMAL)
-            
-            # Start timer in a separate thread
-            self.timer_thread = Thread(target=self.run_timer)
-            self.timer_thread.daemon = True
-            self.timer_thread.start()
+            self.engine.start()
+            self.tick()
     
     def pause_timer(self):
-        self.running = False
+        self.cancel_tick()
+        self.engine.pause()
         self.start_btn.config(state=tk.NORMAL)
         self.pause_btn.config(state=tk.DISABLED)
+        self.update_timer_display()
     
     def reset_timer(self):
-        self.running = False
-        self.mode = "Work"
-        self.time_left = self.work_minutes * 60
-        self.pomodoro_count = 0
+        self.cancel_tick()
+        self.engine.reset()
         self.update_timer_display()
-        self.mode_label.config(text="Work Time")
         self.start_btn.config(state=tk.NORMAL)
         self.pause_btn.config(state=tk.DISABLED)
+        
+    def cancel_tick(self):
+        if self.tick_job:
+            self.root.after_cancel(self.tick_job)
+            self.tick_job = None
     
-    def run_timer(self):
-        start_time = None
-        if self.mode == "Work":
-            start_time = time.time()
-            
-        while self.running and self.time_left > 0:
-            self.time_left -= 1
-            self.root.after(0, self.update_timer_display)
-            time.sleep(1)
-            
-        # If timer completed naturally (not paused)
-        if self.running and self.time_left <= 0:
-            # Record focus session if it was work time
-            if self.mode == "Work" and start_time is not None:
-                focus_duration = (time.time() - start_time) / 60  # in minutes
-                self.today_focus_minutes += int(focus_duration)
-                self.focus_sessions.append({
-                    'date': datetime.datetime.now().strftime('%Y-%m-%d'),
-                    'start_time': datetime.datetime.fromtimestamp(start_time).strftime('%H:%M'),
-                    'duration_minutes': int(focus_duration)
-                })
-                self.save_data()
-                self.today_stats_label.config(text=f"Today's Focus: {self.today_focus_minutes} minutes")
-            
-            # Determine next timer mode
-            self.switch_mode()
-            
-            # Notify user
-            message = "Time's up! "
-            if self.mode == "Work":
-                message += "Focus time starts now."
-            else:
-                message += f"{self.mode} time starts now."
-            
-            self.root.after(0, lambda: show_notification("Pomodoro Timer", message))
-            
-            # Start next timer period automatically
-            self.root.after(1000, self.start_timer)
-    
-    def switch_mode(self):
-        if self.mode == "Work":
-            self.pomodoro_count += 1
-            
-            if self.pomodoro_count % self.max_pomodoros == 0:
-                self.mode = "Long Break"
-                self.time_left = self.long_break_minutes * 60
-                self.mode_label.config(text="Long Break")
-            else:
-                self.mode = "Short Break"
-                self.time_left = self.short_break_minutes * 60
-                self.mode_label.config(text="Short Break")
-        else:
-            self.mode = "Work"
-            self.time_left = self.work_minutes * 60
-            self.mode_label.config(text="Work Time")
+    def tick(self):
+        """Poll the engine and reschedule for the next visible change"""
+        self.tick_job = None
+        self.engine.poll()
+        self.update_timer_display()
+        if not self.engine.running:
+            return
             
+        # Wake up just after the displayed value will next change
+        step = 0.1 if self.show_tenths and self.engine.time_left < 10 else 1.0
+        delay = self.engine.next_change_delay(step)
+        self.tick_job = self.root.after(max(1, int(delay * 1000) + 1), self.tick)
+        
+    def on_session_recorded(self, session):
+        self.today_focus_minutes += session['duration_minutes']
+        self.today_stats_label.config(text=f"Today's Focus: {self.today_focus_minutes} minutes")
+        
+        # Keep an open report current
+        if self.report_window and self.report_window.winfo_viewable():
+            self.draw_report()
+        
+    def on_mode_change(self, mode, seconds):
+        self.mode_label.config(text="Work Time" if mode == "Work" else mode)
         self.update_timer_display()
+        
+    def on_period_complete(self, finished_mode):
+        # Notify user once the engine has switched to the next period
+        self.root.after_idle(self.announce_next_period)
+        
+    def announce_next_period(self):
+        mode = self.engine.mode
+        message = "Time's up! "
+        if mode == "Work":
+            message += "Focus time starts now."
+        else:
+            message += f"{mode} time starts now."
+        
+        show_notification("Pomodoro Timer", message)
+        
+        # Start next timer period automatically
+        self.start_btn.config(state=tk.NORMAL)
+        self.pause_btn.config(state=tk.DISABLED)
+        self.root.after(1000, self.start_timer)
     
     def load_data(self):
-        # Create the data file if it doesn't exist
-        if not os.path.exists(self.data_file):
-            with open(self.data_file, 'w', newline='') as file:
-                writer = csv.writer(file)
-                writer.writerow(['date', 'start_time', 'duration_minutes'])
-            return
-            
-        # Load existing data
+        # Open the session log; today's total comes from its per-day index
+        self.session_log = SessionLog(self.data_file)
         today = datetime.datetime.now().strftime('%Y-%m-%d')
-        self.focus_sessions = []
-        
-        with open(self.data_file, 'r') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                self.focus_sessions.append(row)
-                # Calculate today's total
-                if row['date'] == today:
-                    self.today_focus_minutes += int(row['duration_minutes'])
-    
-    def save_data(self):
-        # Write all sessions to CSV
-        with open(self.data_file, 'w', newline='') as file:
-            writer = csv.DictWriter(file, fieldnames=['date', 'start_time', 'duration_minutes'])
-            writer.writeheader()
-            for session in self.focus_sessions:
-                writer.writerow(session)
+        self.today_focus_minutes = self.session_log.total_for(today)
     
     def show_visualization(self):
-        # Create a new window for visualization
-        viz_window = tk.Toplevel(self.root)
-        viz_window.title("Weekly Focus Report")
-        viz_window.geometry("800x600")
-        
-        # Get the last 7 days of data
-        today = datetime.datetime.now().date()
-        dates = [(today - datetime.timedelta(days=i)).strftime('%Y-%m-%d') for i in range(6, -1, -1)]
-        
-        # Calculate daily totals
-        daily_totals = {date: 0 for date in dates}
-        
-        for session in self.focus_sessions:
-            if session['date'] in daily_totals:
-                daily_totals[session['date']] += int(session['duration_minutes'])
+        # Reuse the report window if it has been opened before
+        if self.report_window is None:
+            self.build_report_window()
+        else:
+            self.report_window.deiconify()
+            self.report_window.lift()
+        self.draw_report()
+        
+    def build_report_window(self):
+        load_plotting()
+        self.report_window = tk.Toplevel(self.root)
+        self.report_window.title("Focus Report")
+        self.report_window.geometry("800x600")
+        # Hide instead of destroying so the figure survives for the next open
+        self.report_window.protocol("WM_DELETE_WINDOW", self.report_window.withdraw)
+        
+        # Range selector
+        range_frame = ttk.Frame(self.report_window)
+        range_frame.pack(side=tk.TOP, pady=5)
+        self.report_range = tk.StringVar(value="Week")
+        for name in FocusReport.RANGES:
+            ttk.Radiobutton(range_frame, text=name, value=name, variable=self.report_range,
+                            command=self.draw_report).pack(side=tk.LEFT, padx=5)
+        
+        # Create figure and canvas
+        self.report_figure = Figure(figsize=(8, 5), dpi=100)
+        self.report_axes = self.report_figure.add_subplot(111)
+        self.report_canvas = FigureCanvasTkAgg(self.report_figure, master=self.report_window)
+        self.report_canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
+        
+        # Statistics text
+        self.report_stats = ttk.Label(self.report_window)
+        self.report_stats.pack(pady=10)
         
-        # Create figure and plot
-        fig, ax = plt.Figure(figsize=(8, 5), dpi=100)
-        ax = fig.add_subplot(111)
+        # Close button
+        close_btn = ttk.Button(self.report_window, text="Close", command=self.report_window.withdraw)
+        close_btn.pack(pady=10)
         
-        # Format x-axis dates to be more readable (just show day of week)
-        display_dates = []
-        for date_str in dates:
-            dt = datetime.datetime.strptime(date_str, '%Y-%m-%d')
-            display_dates.append(dt.strftime('%a'))
+    def draw_report(self):
+        """Redraw the existing report figure for the selected range"""
+        data = self.report.aggregate(self.report_range.get())
+        ax = self.report_axes
+        ax.clear()
         
         # Plot bar chart
-        bars = ax.bar(display_dates, [daily_totals[date] for date in dates])
-        
-        # Add data labels on top of bars
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height + 1,
-                    f"{int(height)}" if height > 0 else "0",
-                    ha='center', va='bottom')
+        bars = ax.bar(range(len(data["values"])), data["values"])
+        ax.set_xticks(range(len(data["labels"])))
+        ax.set_xticklabels(data["labels"])
+        
+        # Add data labels on top of bars (skipped when there are too many to read)
+        if len(bars) <= 12:
+            for bar in bars:
+                height = bar.get_height()
+                ax.text(bar.get_x() + bar.get_width()/2., height + 1,
+                        f"{int(height)}" if height > 0 else "0",
+                        ha='center', va='bottom')
         
         # Customize the plot
         ax.set_ylabel('Focus Minutes')
-        ax.set_title('Daily Focus Time (Last 7 Days)')
+        ax.set_title(data["title"])
         ax.grid(axis='y', linestyle='--', alpha=0.7)
+        self.report_canvas.draw_idle()
         
-        # Create canvas
-        canvas = FigureCanvasTkAgg(fig, master=viz_window)
-        canvas.draw()
-        canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=1)
-        
-        # Add statistics text
-        total_focus = sum(daily_totals.values())
-        avg_daily = total_focus / 7
-        
-        stats_text = ttk.Label(viz_window, 
-                              text=f"Total focus time: {total_focus} minutes ({total_focus/60:.1f} hours)\n"
-                                   f"Daily average: {avg_daily:.1f} minutes")
-        stats_text.pack(pady=10)
-        
-        # Close button
-        close_btn = ttk.Button(viz_window, text="Close", command=viz_window.destroy)
-        close_btn.pack(pady=10)
+        total_focus = data["total"]
+        self.report_stats.config(
+            text=f"Total focus time: {total_focus} minutes ({total_focus/60:.1f} hours)\n"
+                 f"Daily average: {data['daily_average']:.1f} minutes"
+        )
+
+def run_cli(cycles=None, data_file="pomodoro_data.csv"):
+    """Run the timer in the terminal, without Tk or matplotlib"""
+    engine = PomodoroEngine(session_log=SessionLog(data_file), auto_continue=True)
+    completed = []
+    
+    def on_period_complete(mode):
+        print()
+        message = "Time's up! " + ("Break time starts now." if mode == "Work" else "Focus time starts now.")
+        notify_cli("Pomodoro Timer", message)
+        if mode == "Work":
+            completed.append(mode)
+            if cycles is not None and len(completed) >= cycles:
+                # Let the period finish without chaining into the break
+                engine.auto_continue = False
+                
+    engine.on("period_complete", on_period_complete)
+    engine.on("session_recorded", lambda session: print(f"\nLogged {session['duration_minutes']} focus minutes.", end=""))
+    engine.start()
+    try:
+        while engine.running:
+            engine.poll()
+            print(f"\r{engine.mode:<11} {format_countdown(engine.time_left)}", end="", flush=True)
+            time.sleep(engine.next_change_delay() + 0.001)
+    except KeyboardInterrupt:
+        engine.pause()
+    print()
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(description="Pomodoro Timer")
+    parser.add_argument('--cli', action='store_true', help="Run in the terminal without the GUI")
+    parser.add_argument('--cycles', type=int, help="Stop after this many work periods (CLI mode)")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = PomodoroTimer(root)
-    root.protocol("WM_DELETE_WINDOW", lambda: (app.running and app.pause_timer(), root.destroy()))
-    root.mainloop() 
\ No newline at end of file
+    args = parse_arguments()
+    
+    if args.cli:
+        run_cli(args.cycles)
+    else:
+        load_tk()
+        root = tk.Tk()
+        app = PomodoroTimer(root)
+        root.protocol("WM_DELETE_WINDOW", lambda: (app.pause_timer(), root.destroy()))
+        root.mainloop() 
\ No newline at end of file